@@ -0,0 +1,261 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from api.cache import CacheStats, get_api_cache
+
+User = get_user_model()
+TOKEN_VERSION_CLAIM = 'token_version'
+# Поля пользователя, от которых зависят claims роли в токене.
+TOKEN_CLAIM_FIELDS = ('role', 'is_active', 'is_staff', 'is_superuser')
+# Поля пользователя, которые хранит кеш аутентификации.
+SNAPSHOT_FIELDS = ('id', 'username', *TOKEN_CLAIM_FIELDS)
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id):
+    get_api_cache().delete(user_cache_key(user_id))
+
+
+def forget_user_on_commit(user_id):
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+class TokenVersionMap:
+    """Версии токенов пользователей в памяти процесса.
+
+    Значение читается из БД не чаще раза в TOKEN_VERSION_CACHE_TIMEOUT
+    секунд; в своём процессе смена версии видна сразу через forget().
+    """
+
+    max_size = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        version = User.objects.filter(pk=user_id).values_list(
+            'token_version', flat=True
+        ).first()
+        with self._lock:
+            if len(self._versions) >= self.max_size:
+                self._versions.clear()
+            self._versions[user_id] = (
+                version, now + settings.TOKEN_VERSION_CACHE_TIMEOUT
+            )
+        return version
+
+    def forget(self, user_id):
+        with self._lock:
+            self._versions.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+
+
+token_versions = TokenVersionMap()
+
+
+def forget_token_version_on_commit(user_id):
+    transaction.on_commit(lambda: token_versions.forget(user_id))
+
+
+class VerifiedTokenCache:
+    """LRU проверенных токенов: повторный токен не декодируется заново.
+
+    Ключ - SHA-256 строки токена, запись живёт до claim exp. Размер
+    ограничен VERIFIED_TOKEN_CACHE_SIZE, при переполнении вытесняются
+    давно не использованные токены.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = OrderedDict()
+        self.stats = CacheStats()
+
+    @staticmethod
+    def digest(raw_token):
+        return hashlib.sha256(raw_token).digest()
+
+    def get(self, raw_token):
+        key = self.digest(raw_token)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._tokens[key]
+                entry = None
+            if entry is not None:
+                self._tokens.move_to_end(key)
+        if entry is None:
+            self.stats.miss()
+            return None
+        self.stats.hit()
+        return entry[0]
+
+    def set(self, raw_token, token):
+        expires = token.get('exp')
+        if expires is None:
+            return
+        key = self.digest(raw_token)
+        with self._lock:
+            self._tokens[key] = (token, expires)
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > settings.VERIFIED_TOKEN_CACHE_SIZE:
+                self._tokens.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def access_token_for(user):
+    """Access-токен; при JWT_ROLE_CLAIMS - с ролью и версией токенов."""
+    token = AccessToken.for_user(user)
+    if settings.JWT_ROLE_CLAIMS:
+        token['username'] = user.username
+        token['role'] = user.role
+        token['is_admin'] = user.is_admin
+        token['is_moderator'] = user.is_moderator
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+class ClaimsUser(TokenUser):
+    """Пользователь, собранный из claims токена без обращения к БД."""
+
+    @property
+    def role(self):
+        return self.token.get('role')
+
+    @property
+    def is_admin(self):
+        return bool(self.token.get('is_admin'))
+
+    @property
+    def is_moderator(self):
+        return bool(self.token.get('is_moderator'))
+
+
+class CachedUser:
+    """Пользователь из снимка в кеше API: id, имя, роль и флаги доступа.
+
+    Профиль в снимок не входит; для чтения или изменения профиля
+    пользователя нужно загрузить из БД.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    # Права вычисляются так же, как у модели пользователя.
+    is_admin = User.is_admin
+    is_moderator = User.is_moderator
+
+    def __init__(self, snapshot):
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, snapshot[field])
+        self.pk = self.id
+        self.password_hash = snapshot['password_hash']
+
+    def __str__(self):
+        return self.username
+
+    @staticmethod
+    def snapshot(user):
+        return {
+            **{field: getattr(user, field) for field in SNAPSHOT_FIELDS},
+            'password_hash': get_md5_hash_password(user.password),
+        }
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, запоминающая снимок пользователя в кеше API.
+
+    В кеше лежит не модель, а словарь CachedUser.snapshot(): id, имя,
+    роль, флаги доступа и хеш пароля для CHECK_REVOKE_TOKEN; при попадании
+    request.user - CachedUser. Запись живёт AUTH_USER_CACHE_TIMEOUT секунд
+    и удаляется при каждом сохранении или удалении пользователя
+    (api.signals), поэтому смена роли или блокировка действуют
+    со следующего запроса. Изменения через
+    QuerySet.update() сигналов не вызывают и видны только по истечении TTL.
+
+    Подпись повторно присланного токена не проверяется: проверенные токены
+    хранятся в verified_tokens до истечения срока действия.
+
+    Токены с claims роли (JWT_ROLE_CLAIMS) проверяются только по версии
+    токенов пользователя, request.user для них - ClaimsUser.
+    """
+
+    cache_stats = CacheStats()
+
+    def get_validated_token(self, raw_token):
+        token = verified_tokens.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            verified_tokens.set(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        if settings.JWT_ROLE_CLAIMS and TOKEN_VERSION_CLAIM in validated_token:
+            return self.get_claims_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cache = get_api_cache()
+        key = user_cache_key(user_id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            self.cache_stats.miss()
+            user = super().get_user(validated_token)
+            cache.set(
+                key, CachedUser.snapshot(user),
+                settings.AUTH_USER_CACHE_TIMEOUT
+            )
+            return user
+
+        self.cache_stats.hit()
+        user = CachedUser(snapshot)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь заблокирован.', code='user_inactive'
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != user.password_hash:
+            raise AuthenticationFailed(
+                'Пароль пользователя изменён.', code='password_changed'
+            )
+        return user
+
+    def get_claims_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+        if token_versions.get(user.pk) != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                'Роль пользователя изменилась, получите новый токен.',
+                code='token_outdated'
+            )
+        return user
@@ -0,0 +1,96 @@
+from django.db import transaction
+
+from api.cache import CATALOG_VERSION, bump_version_on_commit
+from api.genre_index import GENRE_INDEX_VERSION
+from api.serializers import TitleBulkItemSerializer
+from reviews.models import Category, Genre, Title
+from reviews.search import index_titles
+
+BULK_BATCH_SIZE = 500
+DOES_NOT_EXIST_MESSAGE = 'Объект с slug={value} не существует.'
+
+
+def validate_items(items):
+    """Проверяет элементы по отдельности и собирает все встреченные slug."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = TitleBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return valid, errors
+
+
+def resolve_slugs(valid, errors):
+    """Находит категории и жанры одним запросом на таблицу."""
+    categories = {
+        category.slug: category for category in Category.objects.filter(
+            slug__in={data['category'] for _, data in valid}
+        )
+    }
+    genres = dict(Genre.objects.filter(
+        slug__in={slug for _, data in valid for slug in data['genre']}
+    ).values_list('slug', 'pk'))
+
+    resolved = []
+    for index, data in valid:
+        item_errors = {}
+        if data['category'] not in categories:
+            item_errors['category'] = [
+                DOES_NOT_EXIST_MESSAGE.format(value=data['category'])
+            ]
+        missing = [slug for slug in data['genre'] if slug not in genres]
+        if missing:
+            item_errors['genre'] = [
+                DOES_NOT_EXIST_MESSAGE.format(value=slug) for slug in missing
+            ]
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        title = Title(
+            name=data['name'],
+            year=data['year'],
+            description=data.get('description'),
+            category=categories[data['category']],
+        )
+        resolved.append(
+            (index, title, list(dict.fromkeys(
+                genres[slug] for slug in data['genre']
+            )))
+        )
+    return resolved
+
+
+def create_titles(items, batch_size=BULK_BATCH_SIZE):
+    """Массово создаёт произведения из списка словарей.
+
+    Ошибочные элементы пропускаются и возвращаются с индексами,
+    остальные сохраняются одной транзакцией. bulk_create не вызывает
+    сигналов, поэтому поисковый индекс и версии кешей обновляются здесь.
+    """
+    valid, errors = validate_items(items)
+    resolved = resolve_slugs(valid, errors) if valid else []
+    errors.sort(key=lambda error: error['index'])
+    if not resolved:
+        return [], errors
+
+    titles = [title for _, title, _ in resolved]
+    through = Title.genre.through
+    with transaction.atomic():
+        Title.objects.bulk_create(titles, batch_size=batch_size)
+        through.objects.bulk_create(
+            (
+                through(title_id=title.pk, genre_id=genre_id)
+                for _, title, genre_ids in resolved
+                for genre_id in genre_ids
+            ),
+            batch_size=batch_size
+        )
+        index_titles(titles, batch_size=batch_size, replace=False)
+        bump_version_on_commit(CATALOG_VERSION)
+        bump_version_on_commit(GENRE_INDEX_VERSION)
+    created = [
+        {'index': index, 'id': title.pk} for index, title, _ in resolved
+    ]
+    return created, errors
@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+CATALOG_VERSION = 'catalog'
+
+
+def reviews_version(title_id):
+    return f'reviews:{int(title_id)}'
+
+
+def comments_version(review_id):
+    return f'comments:{int(review_id)}'
+
+
+class CacheStats:
+    """Потокобезопасные счётчики попаданий и промахов кеша."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+def get_api_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def version_key(name):
+    return f'version:{name}'
+
+
+def get_version(name):
+    """Текущая версия набора данных.
+
+    Версия - отметка времени в наносекундах: если ключ вытеснен из кеша,
+    новая версия не совпадёт ни с одной из прежних.
+    """
+    cache = get_api_cache()
+    version = cache.get(version_key(name))
+    if version is None:
+        cache.add(version_key(name), time.time_ns(), timeout=None)
+        version = cache.get(version_key(name))
+    return version
+
+
+def bump_version(name):
+    get_api_cache().set(version_key(name), time.time_ns(), timeout=None)
+
+
+def bump_version_on_commit(name):
+    bump_versions_on_commit([name])
+
+
+def bump_versions(names):
+    version = time.time_ns()
+    get_api_cache().set_many(
+        {version_key(name): version for name in names}, timeout=None
+    )
+
+
+class PendingVersions:
+    """Версии, сдвинутые в текущей транзакции; пишутся в кеш при коммите."""
+
+    def __init__(self):
+        self.names = {}
+
+    def __call__(self):
+        bump_versions(self.names)
+
+
+def bump_versions_on_commit(names):
+    """Сдвигает версии после коммита одной записью в кеш на транзакцию.
+
+    Имена копятся до коммита, поэтому каскадное удаление сотен строк
+    не ставит в очередь запись в кеш на каждую из них. Вне транзакции
+    версии сдвигаются сразу.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        bump_versions(list(dict.fromkeys(names)))
+        return
+    pending = getattr(connection, 'pending_versions', None)
+    # После коммита или отката обработчик уходит из run_on_commit.
+    if pending is None or not any(
+        callback is pending for _, callback, _ in connection.run_on_commit
+    ):
+        pending = connection.pending_versions = PendingVersions()
+        transaction.on_commit(pending)
+    pending.names.update(dict.fromkeys(names))
+
+
+def version_timestamp(version):
+    """Секунда версии для Last-Modified или None, пока она не закончилась.
+
+    HTTP-дата точна до секунды: запись в ту же секунду не сдвинула бы
+    Last-Modified, и клиент с If-Modified-Since получил бы 304.
+    """
+    timestamp = version // 10 ** 9
+    if timestamp >= int(time.time()):
+        return None
+    return timestamp
+
+
+def make_etag(version, *parts):
+    source = ':'.join(str(part) for part in (version, *parts))
+    return '"{}"'.format(hashlib.sha1(source.encode()).hexdigest())
+
+
+def make_cache_key(prefix, version, query_params, *parts):
+    """Ключ кеша по нормализованным параметрам запроса.
+
+    parts - прочие данные, от которых зависит ответ, например адрес
+    сайта в абсолютных ссылках пагинации.
+    """
+    params = sorted(
+        (key, [value.strip() for value in values])
+        for key, values in query_params.lists()
+        if any(value.strip() for value in values)
+    )
+    digest = hashlib.sha1(repr((params, parts)).encode()).hexdigest()
+    return f'{prefix}:{version}:{digest}'
@@ -0,0 +1,56 @@
+import csv
+import json
+
+from rest_framework import serializers
+
+EXPORT_CHUNK_SIZE = 2000
+REVIEW_EXPORT_COLUMNS = {
+    'id': 'id',
+    'author': 'author__username',
+    'text': 'text',
+    'score': 'score',
+    'pub_date': 'pub_date',
+    'comment_count': 'comment_count',
+}
+OUTPUT_NDJSON = 'ndjson'
+OUTPUT_CSV = 'csv'
+CONTENT_TYPES = {
+    OUTPUT_NDJSON: 'application/x-ndjson; charset=utf-8',
+    OUTPUT_CSV: 'text/csv; charset=utf-8',
+}
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Словари отзывов в порядке публикации, читаемые из БД порциями."""
+    date_field = serializers.DateTimeField()
+    rows = queryset.order_by('pub_date', 'id').values_list(
+        *REVIEW_EXPORT_COLUMNS.values()
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        item = dict(zip(REVIEW_EXPORT_COLUMNS, row))
+        item['pub_date'] = date_field.to_representation(item['pub_date'])
+        yield item
+
+
+def ndjson_lines(items):
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False) + '\n'
+
+
+def csv_lines(items):
+    writer = csv.DictWriter(Echo(), fieldnames=list(REVIEW_EXPORT_COLUMNS))
+    yield writer.writerow(
+        {column: column for column in REVIEW_EXPORT_COLUMNS}
+    )
+    for item in items:
+        yield writer.writerow(item)
+
+
+RENDERERS = {OUTPUT_NDJSON: ndjson_lines, OUTPUT_CSV: csv_lines}
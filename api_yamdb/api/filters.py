@@ -1,16 +1,121 @@
+import json
+
 import django_filters
+from django.db import connection
+from django.db.models import Count, F
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import OrderingFilter
 
+from api.genre_index import genre_index
 from reviews.models import Title
+from reviews.search import filter_by_tokens, search_titles
+
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+# Больше id не передаём в IN (...) отдельными параметрами: список уходит
+# в БД одним JSON-параметром и разворачивается там.
+GENRE_INDEX_MAX_IDS = 10000
+JSON_IDS_SQL = {
+    'sqlite': 'SELECT value FROM json_each(%s)',
+    'postgresql': (
+        'SELECT value::bigint FROM jsonb_array_elements_text(%s::jsonb)'
+    ),
+}
+
+
+def split_slugs(value):
+    return [slug.strip() for slug in value.split(',') if slug.strip()]
+
+
+class StableOrderingFilter(OrderingFilter):
+    """OrderingFilter с добавлением id для однозначного порядка.
+
+    id идёт в направлении последнего поля, чтобы сортировку покрывал
+    составной индекс (поле, id). Без ?ordering= порядок, заданный
+    фильтрами (например, релевантность поиска), сохраняется.
+    """
+
+    tie_breaker = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            not request.query_params.get(self.ordering_param)
+            and queryset.query.order_by
+        ):
+            return None
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or any(
+            field.lstrip('-') == self.tie_breaker for field in ordering
+        ):
+            return ordering
+        prefix = '-' if ordering[-1].startswith('-') else ''
+        return [*ordering, prefix + self.tie_breaker]
 
 
 class TitleFilter(django_filters.FilterSet):
-    category = django_filters.CharFilter(field_name='category__slug')
-    genre = django_filters.CharFilter(field_name='genre__slug')
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
+    genre_mode = django_filters.ChoiceFilter(
+        choices=((GENRE_MODE_ANY, 'Любой'), (GENRE_MODE_ALL, 'Все')),
+        method='filter_genre_mode'
     )
+    name = django_filters.CharFilter(method='filter_name')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['category', 'genre', 'name', 'year']
+        fields = ['category', 'genre', 'genre_mode', 'name', 'year', 'search']
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(category__slug__in=split_slugs(value))
+
+    def filter_genre(self, queryset, name, value):
+        slugs = split_slugs(value)
+        match_all = self.form.cleaned_data.get('genre_mode') == GENRE_MODE_ALL
+        large = genre_index.max_count(slugs, match_all) > GENRE_INDEX_MAX_IDS
+        title_ids = genre_index.title_ids(slugs, match_all)
+        sql = JSON_IDS_SQL.get(connection.vendor)
+        if large and sql:
+            title_ids = RawSQL(sql, [json.dumps(title_ids)])
+        return queryset.filter(pk__in=title_ids)
+
+    def filter_genre_mode(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
+
+    def filter_name(self, queryset, name, value):
+        return filter_by_tokens(queryset, value)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+def facet_counts(queryset, key, name, by_count=True):
+    rows = queryset.order_by().values(key).annotate(count=Count('pk'))
+    facets = [
+        {name: row[key], 'count': row['count']}
+        for row in rows if row[key] is not None
+    ]
+    if by_count:
+        return sorted(facets, key=lambda item: (-item['count'], item[name]))
+    return sorted(facets, key=lambda item: item[name])
+
+
+def title_facets(queryset, by_decade=False):
+    """Счётчики по категориям, жанрам и годам для отфильтрованных произведений.
+
+    Всегда выполняет четыре группирующих запроса независимо от числа значений.
+    """
+    titles = Title.objects.filter(pk__in=queryset.order_by().values('pk'))
+    links = Title.genre.through.objects.filter(title__in=titles)
+    if by_decade:
+        years = titles.annotate(decade=F('year') / 10 * 10)
+        year_facets = facet_counts(years, 'decade', 'decade', by_count=False)
+    else:
+        year_facets = facet_counts(titles, 'year', 'year', by_count=False)
+    return {
+        'count': titles.count(),
+        'category': facet_counts(titles, 'category__slug', 'slug'),
+        'genre': facet_counts(links, 'genre__slug', 'slug'),
+        'year': year_facets,
+    }
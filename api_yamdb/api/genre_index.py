@@ -0,0 +1,85 @@
+import threading
+from array import array
+from bisect import bisect_left
+from heapq import merge
+
+from api.cache import get_version
+from reviews.models import Title
+
+GENRE_INDEX_VERSION = 'genre-index'
+
+
+class GenreIndex:
+    """Инвертированный индекс: slug жанра -> отсортированные id произведений.
+
+    Индекс живёт в памяти процесса и перестраивается одним запросом,
+    когда меняется версия GENRE_INDEX_VERSION в общем кеше API.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._postings = {}
+
+    def get_postings(self):
+        version = get_version(GENRE_INDEX_VERSION)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._postings = self.build()
+                    self._version = version
+        return self._postings
+
+    @staticmethod
+    def build():
+        postings = {}
+        links = Title.genre.through.objects.order_by(
+            'genre_id', 'title_id'
+        ).values_list('genre__slug', 'title_id')
+        for slug, title_id in links.iterator(chunk_size=10000):
+            postings.setdefault(slug, array('q')).append(title_id)
+        return postings
+
+    def max_count(self, slugs, match_all=False):
+        """Верхняя граница размера ответа по длинам списков, без их обхода."""
+        postings = self.get_postings()
+        lengths = [len(postings.get(slug, ())) for slug in set(slugs)]
+        if not lengths:
+            return 0
+        return min(lengths) if match_all else sum(lengths)
+
+    def title_ids(self, slugs, match_all=False):
+        postings = self.get_postings()
+        lists = [postings.get(slug, ()) for slug in set(slugs)]
+        if not lists:
+            return []
+        if match_all:
+            return intersect(lists)
+        return unite(lists)
+
+
+def contains(sorted_ids, value):
+    position = bisect_left(sorted_ids, value)
+    return position < len(sorted_ids) and sorted_ids[position] == value
+
+
+def intersect(lists):
+    """Пересечение отсортированных списков: обходим самый короткий."""
+    lists = sorted(lists, key=len)
+    shortest, others = lists[0], lists[1:]
+    return [
+        value for value in shortest
+        if all(contains(other, value) for other in others)
+    ]
+
+
+def unite(lists):
+    """Объединение отсортированных списков без повторов."""
+    result = []
+    for value in merge(*lists):
+        if not result or result[-1] != value:
+            result.append(value)
+    return result
+
+
+genre_index = GenreIndex()
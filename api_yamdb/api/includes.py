@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+
+from api.serializers import CommentSerializer, ReviewSerializer
+from reviews.models import Comment, Review
+
+INCLUDE_REVIEWS = 'reviews'
+INCLUDE_COMMENTS = 'reviews.comments'
+INCLUDE_CHOICES = (INCLUDE_REVIEWS, INCLUDE_COMMENTS)
+
+
+def parse_includes(request):
+    """Связи из параметра ?include=; reviews.comments включает reviews."""
+    value = request.query_params.get('include', '')
+    includes = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = includes.difference(INCLUDE_CHOICES)
+    if unknown:
+        raise ValidationError({'include': [
+            'Неизвестные связи: {}. Доступны: {}.'.format(
+                ', '.join(sorted(unknown)), ', '.join(INCLUDE_CHOICES)
+            )
+        ]})
+    if INCLUDE_COMMENTS in includes:
+        includes.add(INCLUDE_REVIEWS)
+    return includes
+
+
+def first_per_parent(queryset, parent_field, parent_ids, limit):
+    """Первые `limit` объектов каждого родителя одним запросом.
+
+    Нумерация строк внутри родителя делается оконной функцией,
+    порядок - по дате публикации и id.
+    """
+    ordering = ('pub_date', 'id')
+    return queryset.filter(**{f'{parent_field}__in': parent_ids}).annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=F(parent_field),
+            order_by=[F(field).asc() for field in ordering]
+        )
+    ).filter(position__lte=limit).order_by(parent_field, *ordering)
+
+
+def embed_reviews(title_id, with_comments):
+    """Первая страница отзывов произведения с первыми комментариями."""
+    reviews = first_per_parent(
+        Review.objects.select_related('author'), 'title', [title_id],
+        settings.TITLE_INCLUDE_REVIEWS
+    )
+    data = ReviewSerializer(reviews, many=True).data
+    if not with_comments or not data:
+        return data
+
+    comments = {}
+    for comment in first_per_parent(
+        Comment.objects.select_related('author'), 'review',
+        [review['id'] for review in data], settings.TITLE_INCLUDE_COMMENTS
+    ):
+        comments.setdefault(comment.review_id, []).append(comment)
+    for review in data:
+        review['comments'] = CommentSerializer(
+            comments.get(review['id'], []), many=True
+        ).data
+    return data
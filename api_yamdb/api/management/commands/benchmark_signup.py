@@ -0,0 +1,73 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+
+from users.models import OutgoingEmail
+
+User = get_user_model()
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет число регистраций в секунду при параллельных запросах: '
+        'сначала новые пользователи, затем повторная регистрация тех же. '
+        'Созданные пользователи и письма затем удаляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--signups', type=int, default=500,
+            help='Количество регистраций в каждом замере.'
+        )
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Количество параллельных клиентов.'
+        )
+
+    def handle(self, *args, signups, threads, **options):
+        prefix = f'bench{uuid.uuid4().hex[:8]}'
+        payloads = [
+            {'username': f'{prefix}_{idx}', 'email': f'{prefix}_{idx}@b.fake'}
+            for idx in range(signups)
+        ]
+        chunks = [payloads[idx::threads] for idx in range(threads)]
+        try:
+            with override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+            ):
+                for label in ('Новые пользователи', 'Повторная регистрация'):
+                    elapsed, errors = self.run(chunks, threads)
+                    self.stdout.write(
+                        f'{label}: {signups / elapsed:,.0f} регистраций/с '
+                        f'(потоков: {threads}, ошибок: {errors})'
+                    )
+        finally:
+            users = User.objects.filter(username__startswith=f'{prefix}_')
+            OutgoingEmail.objects.filter(
+                recipient__startswith=f'{prefix}_'
+            ).delete()
+            users.delete()
+
+    def run(self, chunks, threads):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            errors = sum(pool.map(self.signup, chunks))
+        return time.perf_counter() - started, errors
+
+    @staticmethod
+    def signup(payloads):
+        client = Client()
+        errors = 0
+        try:
+            for payload in payloads:
+                response = client.post(SIGNUP_URL, data=payload)
+                errors += response.status_code != 200
+        finally:
+            connection.close()
+        return errors
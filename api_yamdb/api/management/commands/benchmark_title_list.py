@@ -0,0 +1,96 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleListSerializer, TitleReadSerializer
+from reviews.models import Category, Genre, Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость сериализации списка произведений: '
+        'TitleReadSerializer по объектам модели и быстрый путь по values().'
+        ' Тестовые данные создаются во временной транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=1000,
+            help='Количество произведений на странице.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Количество повторов каждого замера.'
+        )
+
+    def handle(self, *args, rows, repeat, **options):
+        with transaction.atomic():
+            title_ids = self.create_titles(rows)
+            queryset = Title.objects.filter(pk__in=title_ids).order_by('pk')
+
+            def serializer_path():
+                return TitleReadSerializer(
+                    queryset.select_related('category')
+                    .prefetch_related('genre'),
+                    many=True
+                ).data
+
+            def fast_path():
+                field_names = TitleReadSerializer().fields
+                return TitleReadSerializer(
+                    queryset.values(
+                        *TitleListSerializer.get_columns(field_names)
+                    ),
+                    many=True
+                ).data
+
+            renderer = JSONRenderer()
+            if renderer.render(serializer_path()) != renderer.render(
+                fast_path()
+            ):
+                raise CommandError('Результаты сериализации различаются.')
+
+            for label, path in (
+                ('TitleReadSerializer', serializer_path),
+                ('values() + TitleListSerializer', fast_path),
+            ):
+                best = min(self.measure(path) for _ in range(repeat))
+                self.stdout.write(
+                    f'{label}: {rows / best:,.0f} строк/с '
+                    f'({best * 1000:.1f} мс на {rows} строк)'
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def measure(path):
+        started = time.perf_counter()
+        path()
+        return time.perf_counter() - started
+
+    @staticmethod
+    def create_titles(rows):
+        category = Category.objects.create(
+            name='Бенчмарк', slug='benchmark-category'
+        )
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'benchmark-{idx}')
+            for idx in range(3)
+        ]
+        titles = Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {idx}',
+                year=2000,
+                description='Описание ' * 20,
+                category=category if idx % 5 else None,
+                rating=idx % 11 or None
+            )
+            for idx in range(rows)
+        )
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+            for title in titles
+            for genre in genres[:title.pk % 4]
+        )
+        return [title.pk for title in titles]
@@ -0,0 +1,78 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from api.authentication import (
+    CachedJWTAuthentication, access_token_for, forget_user, verified_tokens
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает накладные расходы аутентификации одного запроса: '
+        'проверка токена JWTAuthentication и через кеш проверенных токенов. '
+        'Тестовый пользователь создаётся во временной транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=10000,
+            help='Количество запросов с одним токеном в каждом замере.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Количество повторов каждого замера.'
+        )
+
+    def handle(self, *args, requests, repeat, **options):
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username='benchmark_token_user', email='benchmark@b.fake'
+            )
+            try:
+                self.run(user, requests, repeat)
+            finally:
+                forget_user(user.pk)
+                transaction.set_rollback(True)
+
+    def run(self, user, requests, repeat):
+        raw_token = str(access_token_for(user)).encode()
+        request = APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Bearer {raw_token.decode()}'
+        )
+        plain = JWTAuthentication()
+        cached = CachedJWTAuthentication()
+        cached.authenticate(request)
+        verified_tokens.stats.reset()
+
+        for label, path in (
+            ('Проверка токена (JWTAuthentication)',
+             lambda: plain.get_validated_token(raw_token)),
+            ('Проверка токена (кеш проверенных токенов)',
+             lambda: cached.get_validated_token(raw_token)),
+            ('Аутентификация запроса (CachedJWTAuthentication)',
+             lambda: cached.authenticate(request)),
+        ):
+            best = min(
+                self.measure(path, requests) for _ in range(repeat)
+            )
+            self.stdout.write(
+                f'{label}: {best / requests * 1e6:.1f} мкс на запрос'
+            )
+        self.stdout.write(
+            'Доля попаданий в кеш токенов: '
+            f'{verified_tokens.stats.hit_rate:.1%}'
+        )
+
+    @staticmethod
+    def measure(path, requests):
+        started = time.perf_counter()
+        for _ in range(requests):
+            path()
+        return time.perf_counter() - started
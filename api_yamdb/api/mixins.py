@@ -1,4 +1,16 @@
-from rest_framework import filters, mixins, viewsets
+from django.conf import settings
+from django.db.models import Model
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import filters, mixins, permissions, status, viewsets
+from rest_framework.response import Response
+
+from api.cache import (
+    CATALOG_VERSION, get_api_cache, get_version, make_cache_key, make_etag,
+    version_timestamp
+)
+from api.serializers import Fieldset
 
 
 class ListCreateDestroyViewSet(
@@ -10,3 +22,180 @@ class ListCreateDestroyViewSet(
     lookup_field = 'slug'
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+
+
+class CachedListMixin:
+    """Кеширует ответ list по параметрам запроса и версии каталога.
+
+    Любая запись в каталог меняет версию, поэтому устаревшие ответы
+    никогда не отдаются. Подклассы задают `cache_prefix` и `cache_stats`.
+    """
+
+    cache_prefix = None
+    cache_stats = None
+    cache_version_name = CATALOG_VERSION
+
+    def list(self, request, *args, **kwargs):
+        cache = get_api_cache()
+        # Ссылки next и previous абсолютные: схема и хост входят в ключ.
+        key = make_cache_key(
+            self.cache_prefix,
+            get_version(self.cache_version_name),
+            request.query_params,
+            request.build_absolute_uri('/')
+        )
+        data = cache.get(key)
+        if data is not None:
+            self.cache_stats.hit()
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        self.cache_stats.miss()
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.TITLES_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified по версии ресурса для list и retrieve.
+
+    При совпадении If-None-Match или If-Modified-Since возвращается 304
+    без запросов к БД и сериализации. Если версия не задана (None),
+    ответ нельзя описать одной версией и он отдаётся без валидаторов.
+    Версия из текущей секунды описывается только ETag.
+    """
+
+    version_name = None
+
+    def get_version_name(self):
+        return self.version_name
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        version_name = self.get_version_name()
+        if version_name is None:
+            return handler(request, *args, **kwargs)
+        version = get_version(version_name)
+        etag = make_etag(
+            version,
+            request.get_full_path(),
+            request.accepted_renderer.media_type
+        )
+        last_modified = version_timestamp(version)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class SparseFieldsetQuerysetMixin:
+    """Не загружает из БД то, что не попадёт в ответ при ?fields=/?exclude=.
+
+    Ключи словарей - поля ответа, значения - связи или колонки модели.
+    Отбор по полям ответа делается только для чтения. При записи связи
+    подгружаются целиком для ответа, а prefetch пропускается: после
+    изменения DRF всё равно сбрасывает его кеш.
+    """
+
+    select_related_fields = {}
+    prefetch_related_fields = {}
+    deferred_fields = {}
+
+    def sparse_queryset(self, queryset):
+        if self.request.method not in permissions.SAFE_METHODS:
+            if self.select_related_fields:
+                queryset = queryset.select_related(
+                    *self.select_related_fields.values()
+                )
+            return queryset
+        fieldset = Fieldset(self.request)
+        select = [
+            relation for field, relation in self.select_related_fields.items()
+            if field in fieldset
+        ]
+        prefetch = [
+            relation
+            for field, relation in self.prefetch_related_fields.items()
+            if field in fieldset
+        ]
+        deferred = [
+            column for field, column in self.deferred_fields.items()
+            if field not in fieldset
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+
+class NestedParentMixin:
+    """Родитель вложенного маршрута без повторных запросов к БД.
+
+    `parent_lookups` сопоставляет поля модели родителя и kwargs URL,
+    `parent_field` - внешний ключ на родителя. Существование родителя
+    проверяется одним запросом и запоминается на представлении; запрос
+    к одному объекту фильтруется по родителю через JOIN без проверки.
+    """
+
+    parent_model = None
+    parent_field = None
+    parent_lookups = {}
+
+    def get_parent_id(self):
+        if not hasattr(self, '_parent_id'):
+            lookups = {
+                field: self.kwargs[kwarg]
+                for field, kwarg in self.parent_lookups.items()
+            }
+            if not self.parent_model.objects.filter(**lookups).exists():
+                raise Http404
+            self._parent_id = int(lookups['pk'])
+        return self._parent_id
+
+    def get_parent_filter(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg not in self.kwargs:
+            return {f'{self.parent_field}_id': self.get_parent_id()}
+        return {
+            (
+                f'{self.parent_field}_id' if field == 'pk'
+                else f'{self.parent_field}__{field}'
+            ): self.kwargs[kwarg]
+            for field, kwarg in self.parent_lookups.items()
+        }
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**self.get_parent_filter())
+
+    def perform_create(self, serializer):
+        author = self.request.user
+        # Пользователь из claims токена не является записью БД.
+        author_kwargs = (
+            {'author': author} if isinstance(author, Model)
+            else {'author_id': author.pk}
+        )
+        serializer.save(
+            **author_kwargs,
+            **{f'{self.parent_field}_id': self.get_parent_id()}
+        )
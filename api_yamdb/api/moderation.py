@@ -0,0 +1,150 @@
+from collections import Counter
+from itertools import chain
+
+from django.db import transaction
+
+from api.cache import (
+    CATALOG_VERSION, bump_versions_on_commit, comments_version,
+    reviews_version
+)
+from reviews.models import Comment, Review, Title
+from reviews.signals import (
+    AUTHOR_COUNTERS, bulk_mode, shift_author_count, shift_comment_counts
+)
+
+MODERATION_BATCH_SIZE = 1000
+
+
+def id_batches(model, ids, batch_size):
+    """Порции существующих объектов из списка id."""
+    ids = sorted(set(ids))
+    for start in range(0, len(ids), batch_size):
+        yield model.objects.filter(pk__in=ids[start:start + batch_size])
+
+
+def filter_batches(queryset, batch_size):
+    """Порции объектов по фильтру, пока подходящие строки не кончатся.
+
+    Удалённые строки выпадают из выборки, поэтому каждый раз берётся
+    начало выборки.
+    """
+    while True:
+        pks = list(
+            queryset.order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return
+        yield queryset.model.objects.filter(pk__in=pks)
+
+
+def shift_author_counts(model, per_author):
+    for author_id, count in per_author.items():
+        shift_author_count(AUTHOR_COUNTERS[model], author_id, -count)
+
+
+def delete_comments_batch(comments):
+    # Строки блокируются до удаления: вычитаемые счётчики должны совпасть
+    # с удалёнными строками, даже если их параллельно изменяют.
+    rows = list(comments.select_for_update().values_list(
+        'pk', 'review_id', 'author_id'
+    ))
+    if not rows:
+        return 0
+    per_review = Counter(review_id for _, review_id, _ in rows)
+    Comment.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+    shift_comment_counts(
+        {review_id: -count for review_id, count in per_review.items()}
+    )
+    shift_author_counts(
+        Comment, Counter(author_id for _, _, author_id in rows)
+    )
+    bump_versions_on_commit(
+        comments_version(review_id) for review_id in per_review
+    )
+    return len(rows)
+
+
+def delete_reviews_batch(reviews):
+    """Удаляет порцию отзывов и возвращает число отзывов и комментариев."""
+    # Оценки читаются под блокировкой: правка оценки между чтением
+    # и удалением иначе оставила бы неверный рейтинг произведения.
+    rows = list(
+        reviews.select_for_update().values_list(
+            'pk', 'title_id', 'score', 'author_id'
+        )
+    )
+    if not rows:
+        return 0, 0
+    review_ids = [pk for pk, _, _, _ in rows]
+    totals = {}
+    for _, title_id, score, _ in rows:
+        total, count = totals.get(title_id, (0, 0))
+        totals[title_id] = (total + score, count + 1)
+    comments = Comment.objects.filter(review_id__in=review_ids)
+    # FOR UPDATE несовместим с GROUP BY, поэтому авторы считаются в Python.
+    comment_authors = Counter(
+        comments.select_for_update().values_list('author_id', flat=True)
+    )
+
+    comments.delete()
+    Review.objects.filter(pk__in=review_ids).delete()
+    for title_id, (total, count) in totals.items():
+        Title.objects.filter(pk=title_id).apply_rating_delta(-total, -count)
+    shift_author_counts(
+        Review, Counter(author_id for _, _, _, author_id in rows)
+    )
+    shift_author_counts(Comment, comment_authors)
+    bump_versions_on_commit([
+        CATALOG_VERSION,
+        *(reviews_version(title_id) for title_id in totals),
+        *(comments_version(review_id) for review_id in review_ids),
+    ])
+    return len(rows), sum(comment_authors.values())
+
+
+def bulk_delete(review_batches, comment_batches):
+    """Удаляет отзывы и комментарии порциями, каждую в своей транзакции.
+
+    Короткие транзакции не держат блокировку БД долго. Сигналы удаления
+    не пересчитывают счётчики по одному объекту: рейтинг произведений,
+    comment_count отзывов и счётчики авторов сдвигаются суммарно
+    на каждую порцию.
+    """
+    summary = {'reviews': 0, 'comments': 0, 'batches': 0}
+    with bulk_mode():
+        for batch in comment_batches:
+            with transaction.atomic():
+                deleted = delete_comments_batch(batch)
+            summary['comments'] += deleted
+            summary['batches'] += bool(deleted)
+        for batch in review_batches:
+            with transaction.atomic():
+                reviews, comments = delete_reviews_batch(batch)
+            summary['reviews'] += reviews
+            summary['comments'] += comments
+            summary['batches'] += bool(reviews)
+    return summary
+
+
+def delete_content(reviews=(), comments=(), author=None, since=None,
+                   batch_size=MODERATION_BATCH_SIZE):
+    """Удаляет отзывы и комментарии по id и/или все записи автора.
+
+    since ограничивает записи автора датой публикации.
+    """
+    review_batches = [id_batches(Review, reviews, batch_size)]
+    comment_batches = [id_batches(Comment, comments, batch_size)]
+    if author is not None:
+        lookups = {'author': author}
+        if since is not None:
+            lookups['pub_date__gte'] = since
+        review_batches.append(
+            filter_batches(Review.objects.filter(**lookups), batch_size)
+        )
+        comment_batches.append(
+            filter_batches(Comment.objects.filter(**lookups), batch_size)
+        )
+    return bulk_delete(
+        chain.from_iterable(review_batches),
+        chain.from_iterable(comment_batches)
+    )
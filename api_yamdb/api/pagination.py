@@ -0,0 +1,252 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, LimitOffsetPagination, PageNumberPagination
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная пагинация по паре (поле сортировки, id) без COUNT и OFFSET.
+
+    Допустимые поля сортировки берутся из `ordering_fields` представления,
+    сортировка по умолчанию - из его атрибута `ordering`; подкласс может
+    задать их сам одноимёнными атрибутами.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    ordering_param = 'ordering'
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    max_page_size = 100
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Некорректный курсор.'
+    ordering_fields = None
+    ordering = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        field, descending = self.split_ordering(self.ordering)
+        nullable = queryset.model._meta.get_field(field).null
+
+        cursor = self.decode_cursor(request, queryset.model, field)
+        reverse = bool(cursor and cursor['reverse'])
+        queryset = queryset.order_by(
+            *self.order_by(field, descending != reverse)
+        )
+        if cursor:
+            queryset = queryset.filter(self.after(
+                field, cursor['position'], descending == reverse,
+                nullable, queryset.db
+            ))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = cursor is not None, has_more
+        self.page = results
+        self.field = field
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, view):
+        allowed = (
+            self.ordering_fields or getattr(view, 'ordering_fields', None)
+            or ()
+        )
+        ordering = request.query_params.get(self.ordering_param, '')
+        ordering = ordering.split(',')[0].strip()
+        if ordering.lstrip('-') in allowed:
+            return ordering
+        return (
+            self.ordering or getattr(view, 'ordering', None)
+            or [self.tie_breaker]
+        )[0]
+
+    @staticmethod
+    def split_ordering(ordering):
+        return ordering.lstrip('-'), ordering.startswith('-')
+
+    def order_by(self, field, descending):
+        prefix = '-' if descending else ''
+        if field == self.tie_breaker:
+            return [prefix + field]
+        return [prefix + field, prefix + self.tie_breaker]
+
+    def after(self, field, position, greater, nullable, using):
+        """Условие «строго после позиции» в заданном направлении."""
+        value, pk = position
+        lookup = 'gt' if greater else 'lt'
+        tie = Q(**{f'{self.tie_breaker}__{lookup}': pk})
+        if field == self.tie_breaker:
+            return tie
+        nulls_high = connections[using].features.nulls_order_largest
+        if value is None:
+            condition = Q(**{f'{field}__isnull': True}) & tie
+            if nullable and nulls_high != greater:
+                condition |= Q(**{f'{field}__isnull': False})
+            return condition
+        condition = (
+            Q(**{f'{field}__{lookup}': value})
+            | Q(**{field: value}) & tie
+        )
+        if nullable and nulls_high == greater:
+            condition |= Q(**{f'{field}__isnull': True})
+        return condition
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            return [item[self.field], item[self.tie_breaker]]
+        return [getattr(item, self.field), getattr(item, self.tie_breaker)]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def encode_cursor(self, position, reverse):
+        value, pk = position
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = {'p': [value, pk], 'o': self.ordering}
+        if reverse:
+            payload['r'] = 1
+        token = b64encode(
+            json.dumps(payload, separators=(',', ':')).encode()
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token
+        )
+
+    def decode_cursor(self, request, model, field):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(b64decode(token.encode('ascii')))
+            value, pk = payload['p']
+        except (
+            BinasciiError, KeyError, TypeError, UnicodeError, ValueError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        if payload.get('o') != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        return {
+            'position': self.clean_position(model, field, value, pk),
+            'reverse': bool(payload.get('r')),
+        }
+
+    def clean_position(self, model, field, value, pk):
+        """Позиция курсора, приведённая к типам полей модели."""
+        if pk is None or not all(
+            item is None or isinstance(item, (str, int, float))
+            for item in (value, pk)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            pk = model._meta.get_field(self.tie_breaker).to_python(pk)
+            if value is not None:
+                value = model._meta.get_field(field).to_python(value)
+        except (TypeError, ValidationError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+
+class AuthorFeedPagination(KeysetPagination):
+    """Лента записей автора: по умолчанию от новых к старым."""
+
+    ordering_fields = ['pub_date']
+    ordering = ['-pub_date']
+
+
+class CursorOptInMixin:
+    """Включает курсорную пагинацию по запросу, не ломая старый контракт.
+
+    Курсорный режим выбирается параметром `?pagination=cursor`
+    или наличием `cursor` в запросе.
+    """
+
+    cursor_class = KeysetPagination
+    mode_query_param = 'pagination'
+    # Параметры, задающие свой порядок, который курсор сохранить не может.
+    cursor_incompatible_params = ()
+
+    def cursor_requested(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_requested(request):
+            self.check_cursor_params(request)
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def check_cursor_params(self, request):
+        conflicts = [
+            param for param in self.cursor_incompatible_params
+            if request.query_params.get(param)
+        ]
+        if conflicts:
+            raise exceptions.ValidationError({
+                param: ['Не поддерживается в курсорном режиме пагинации.']
+                for param in conflicts
+            })
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(CursorOptInMixin, LimitOffsetPagination):
+    # Результаты поиска отсортированы по релевантности.
+    cursor_incompatible_params = ('search',)
+
+
+class PubDatePagination(CursorOptInMixin, PageNumberPagination):
+    """Номера страниц или курсор по (pub_date, id) для отзывов и комментариев.
+
+    Без параметров курсорного режима ответ прежний, с count и page.
+    """
@@ -11,6 +11,15 @@ class IsAdmin(BasePermission):
         return bool(user and getattr(user, 'is_admin', False))
 
 
+class IsModeratorOrAdmin(BasePermission):
+    def has_permission(self, request, view):
+        user = getattr(request, 'user', None)
+        return bool(user and (
+            getattr(user, 'is_admin', False)
+            or getattr(user, 'is_moderator', False)
+        ))
+
+
 class IsAdminOrReadOnly(BasePermission):
     def has_permission(self, request, view):
         return bool(
@@ -27,7 +36,7 @@ class IsAuthorModeratorAdminOrReadOnly(BasePermission):
         return bool(
             request.method in SAFE_METHODS
             or (user and user.is_authenticated and (
-                obj.author == user
+                obj.author_id == user.pk
                 or getattr(user, 'is_admin', False)
                 or getattr(user, 'is_moderator', False)
             ))
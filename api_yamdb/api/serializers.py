@@ -1,9 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core.validators import RegexValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.http import Http404
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
 
+from api.export import OUTPUT_CSV, OUTPUT_NDJSON
 from reviews.constants import (
     USERNAME_MAX_LENGTH,
     EMAIL_MAX_LENGTH,
@@ -14,6 +19,57 @@ from reviews.models import Category, Comment, Genre, Review, Title
 
 User = get_user_model()
 
+USERNAME_EMAIL_MISMATCH_MESSAGE = (
+    'Этот email используется другим пользователем.'
+)
+EMAIL_TAKEN_MESSAGE = 'Этот email уже используется другим пользователем.'
+DUPLICATE_REVIEW_MESSAGE = 'Нельзя написать два отзыва на произведение'
+
+
+class Fieldset:
+    """Набор полей ответа, заданный параметрами ?fields= и ?exclude=."""
+
+    def __init__(self, request):
+        self.include = self.parse(request, 'fields')
+        self.exclude = self.parse(request, 'exclude')
+
+    @staticmethod
+    def parse(request, param):
+        if request is None or request.method not in SAFE_METHODS:
+            return set()
+        value = request.query_params.get(param, '')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    @property
+    def is_full(self):
+        return not self.include and not self.exclude
+
+    def __contains__(self, name):
+        return (
+            (not self.include or name in self.include)
+            and name not in self.exclude
+        )
+
+
+class SparseFieldsetMixin:
+    """Оставляет в ответе только поля, запрошенные через ?fields=/?exclude=.
+
+    Действует на сериализатор верхнего уровня и только для чтения.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        is_top_level = self.parent is None or (
+            self.parent is self.root
+            and isinstance(self.parent, serializers.ListSerializer)
+        )
+        fieldset = Fieldset(self.context.get('request'))
+        if not is_top_level or fieldset.is_full:
+            return fields
+        return {
+            name: field for name, field in fields.items() if name in fieldset
+        }
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -47,7 +103,79 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance, context=self.context).data
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Проверка одного элемента массовой загрузки без запросов к БД.
+
+    Slug категории и жанров проверяются пакетно в api.bulk.
+    """
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'category', 'genre')
+
+
+class TitleListSerializer(serializers.ListSerializer):
+    """Быстрый путь для страницы произведений, полученной через values().
+
+    Собирает словари напрямую из строк и одного запроса жанров страницы,
+    результат совпадает с выводом TitleReadSerializer.
+    """
+
+    row_columns = ('id', 'name', 'year', 'rating')
+    related_columns = {
+        'description': ('description',),
+        'category': ('category__name', 'category__slug'),
+    }
+
+    @classmethod
+    def get_columns(cls, field_names):
+        columns = list(cls.row_columns)
+        for field, related in cls.related_columns.items():
+            if field in field_names:
+                columns.extend(related)
+        return columns
+
+    def to_representation(self, data):
+        rows = list(data)
+        if not rows or not isinstance(rows[0], dict):
+            return super().to_representation(rows)
+
+        field_names = list(self.child.fields)
+        genres = {}
+        if 'genre' in field_names:
+            links = Title.genre.through.objects.filter(
+                title_id__in=[row['id'] for row in rows]
+            ).order_by('genre__name').values_list(
+                'title_id', 'genre__name', 'genre__slug'
+            )
+            for title_id, name, slug in links:
+                genres.setdefault(title_id, []).append(
+                    {'name': name, 'slug': slug}
+                )
+
+        result = []
+        for row in rows:
+            item = {}
+            for name in field_names:
+                if name == 'category':
+                    item[name] = None if row['category__slug'] is None else {
+                        'name': row['category__name'],
+                        'slug': row['category__slug'],
+                    }
+                elif name == 'genre':
+                    item[name] = genres.get(row['id'], [])
+                else:
+                    item[name] = row[name]
+            result.append(item)
+        return result
+
+
+class TitleReadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     rating = serializers.IntegerField(read_only=True, default=None)
@@ -57,9 +185,10 @@ class TitleReadSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'name', 'year', 'description', 'category', 'genre', 'rating'
         )
+        list_serializer_class = TitleListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
@@ -67,32 +196,87 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comment_count'
+        )
 
-    def validate(self, attrs):
-        if self.context['request'].method != 'POST':
-            return attrs
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_review в БД:
+        # отдельная проверка перед вставкой не защищает от гонки.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            # Автор передан объектом или, из claims токена, только id.
+            review = Review(**validated_data)
+            if not Review.objects.filter(
+                author_id=review.author_id, title_id=review.title_id
+            ).exists():
+                raise
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW_MESSAGE]
+        })
+
+
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    author = serializers.SlugRelatedField(
+        slug_field='username',
+        read_only=True
+    )
 
-        author = self.context['request'].user
-        title_id = self.context['view'].kwargs.get('title_id')
+    class Meta:
+        model = Comment
+        fields = ('id', 'text', 'author', 'pub_date')
 
-        if Review.objects.filter(author=author, title_id=title_id).exists():
-            raise serializers.ValidationError(
-                'Нельзя написать два отзыва на произведение'
-            )
 
-        return attrs
+class AuthorReviewSerializer(ReviewSerializer):
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
 
+class AuthorCommentSerializer(CommentSerializer):
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+    # Аннотация из ленты автора, отзыв целиком не загружается.
+    title = serializers.IntegerField(source='title_id', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('review', 'title')
+
+
+class ReviewExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=(OUTPUT_NDJSON, OUTPUT_CSV), default=OUTPUT_NDJSON
+    )
+    since = serializers.DateTimeField(required=False)
 
-class CommentSerializer(serializers.ModelSerializer):
+
+class BulkDeleteSerializer(serializers.Serializer):
+    reviews = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+    comments = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
     author = serializers.SlugRelatedField(
         slug_field='username',
-        read_only=True
+        queryset=User.objects.all(),
+        required=False
     )
+    since = serializers.DateTimeField(required=False)
 
-    class Meta:
-        model = Comment
-        fields = ('id', 'text', 'author', 'pub_date')
+    def validate(self, data):
+        if 'since' in data and 'author' not in data:
+            raise serializers.ValidationError({
+                'since': 'Дата применяется только вместе с автором.'
+            })
+        if not any((
+            data.get('reviews'), data.get('comments'), 'author' in data
+        )):
+            raise serializers.ValidationError(
+                'Укажите id отзывов и комментариев или автора.'
+            )
+        return data
 
 
 class SignupSerializer(serializers.Serializer):
@@ -117,26 +301,48 @@ class SignupSerializer(serializers.Serializer):
         return value
 
     def validate(self, data):
-        username = data.get('username')
-        email = data.get('email')
-
-        if User.objects.filter(username=username).exists():
-            user = User.objects.get(username=username)
-            if user.email != email:
-                raise serializers.ValidationError({
-                    'email': 'Этот email используется другим пользователем.'
-                })
+        self.existing_user, error = self.find_user(
+            data['username'], data['email']
+        )
+        if error:
+            raise serializers.ValidationError({'email': error})
+        return data
 
-        elif User.objects.filter(email=email).exists():
-            raise serializers.ValidationError({
-                'email': 'Этот email уже используется другим пользователем.'
-            })
+    @staticmethod
+    def find_user(username, email):
+        """Зарегистрированный пользователь и ошибка за один запрос.
 
-        return data
+        По уникальным username и email находится не больше двух записей.
+        """
+        users = list(
+            User.objects.filter(Q(username=username) | Q(email=email))[:2]
+        )
+        for user in users:
+            if user.username == username:
+                if user.email != email:
+                    return None, USERNAME_EMAIL_MISMATCH_MESSAGE
+                return user, None
+        if users:
+            return None, EMAIL_TAKEN_MESSAGE
+        return None, None
 
     def create(self, validated_data):
-        user, _ = User.objects.get_or_create(**validated_data)
-        return user
+        if self.existing_user is not None:
+            return self.existing_user
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            # Параллельная регистрация заняла username или email
+            # между проверкой и вставкой.
+            user, error = self.find_user(
+                validated_data['username'], validated_data['email']
+            )
+            if user is not None:
+                return user
+            if error is None:
+                raise
+            raise serializers.ValidationError({'email': error})
 
 
 class TokenSerializer(serializers.Serializer):
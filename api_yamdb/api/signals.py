@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save
+)
+from django.dispatch import receiver
+
+from api.authentication import (
+    TOKEN_CLAIM_FIELDS, forget_token_version_on_commit, forget_user_on_commit
+)
+from api.cache import (
+    CATALOG_VERSION, bump_version_on_commit, bump_versions_on_commit,
+    comments_version, reviews_version
+)
+from api.genre_index import GENRE_INDEX_VERSION
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import comment_counts_changed, in_bulk_mode
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_catalog_version(sender, **kwargs):
+    if sender is Review and in_bulk_mode():
+        return
+    bump_version_on_commit(CATALOG_VERSION)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_reviews_version(sender, instance, **kwargs):
+    if in_bulk_mode():
+        return
+    bump_version_on_commit(reviews_version(instance.title_id))
+
+
+@receiver(post_delete, sender=Title)
+def bump_title_reviews_version(sender, instance, **kwargs):
+    bump_version_on_commit(reviews_version(instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comments_version(sender, instance, **kwargs):
+    if in_bulk_mode():
+        return
+    bump_version_on_commit(comments_version(instance.review_id))
+
+
+@receiver(comment_counts_changed)
+def bump_comment_count_versions(sender, review_ids, **kwargs):
+    # comment_count отзыва входит в ответы списка отзывов произведения.
+    title_ids = Review.objects.filter(pk__in=review_ids).values_list(
+        'title_id', flat=True
+    ).order_by().distinct()
+    bump_versions_on_commit(
+        [reviews_version(title_id) for title_id in title_ids]
+    )
+
+
+@receiver(post_delete, sender=Review)
+def bump_review_comments_version(sender, instance, **kwargs):
+    if in_bulk_mode():
+        return
+    bump_version_on_commit(comments_version(instance.pk))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_genre_index_version(sender, **kwargs):
+    bump_version_on_commit(GENRE_INDEX_VERSION)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user_on_commit(instance.pk)
+
+
+@receiver(post_init, sender=User)
+def remember_author_username(sender, instance, **kwargs):
+    instance._versioned_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def bump_author_versions(sender, instance, created, **kwargs):
+    """Имя автора входит в ответы отзывов и комментариев."""
+    username = instance.__dict__.get('username')
+    if created or username == instance._versioned_username:
+        return
+    instance._versioned_username = username
+    title_ids = Review.objects.filter(author=instance).values_list(
+        'title_id', flat=True
+    ).order_by().distinct()
+    review_ids = Comment.objects.filter(author=instance).values_list(
+        'review_id', flat=True
+    ).order_by().distinct()
+    bump_versions_on_commit([
+        *(reviews_version(title_id) for title_id in title_ids),
+        *(comments_version(review_id) for review_id in review_ids),
+    ])
+
+
+def token_claim_state(user):
+    return tuple(
+        user.__dict__.get(field) for field in TOKEN_CLAIM_FIELDS
+    )
+
+
+@receiver(post_init, sender=User)
+def remember_token_claim_state(sender, instance, **kwargs):
+    instance._token_claim_state = token_claim_state(instance)
+
+
+@receiver(post_save, sender=User)
+def bump_token_version(sender, instance, created, **kwargs):
+    """Отзывает токены с claims роли, если роль или статус изменились."""
+    state = token_claim_state(instance)
+    if created or state == instance._token_claim_state:
+        return
+    instance._token_claim_state = state
+    User.objects.filter(pk=instance.pk).update(
+        token_version=F('token_version') + 1
+    )
+    forget_token_version_on_commit(instance.pk)
@@ -2,6 +2,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (
+    BulkDeleteView,
     SignupView,
     TokenView,
     UserViewSet,
@@ -37,5 +38,6 @@ auth_patterns = [
 
 urlpatterns = [
     path('v1/auth/', include(auth_patterns)),
+    path('v1/moderation/delete/', BulkDeleteView.as_view()),
     path('v1/', include(router_v1.urls)),
 ]
@@ -1,39 +1,68 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import (
-    LimitOffsetPagination, PageNumberPagination
-)
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.filters import TitleFilter
-from api.mixins import ListCreateDestroyViewSet
+from api.authentication import access_token_for
+from api.bulk import create_titles
+from api.cache import (
+    CATALOG_VERSION,
+    CacheStats,
+    comments_version,
+    get_api_cache,
+    get_version,
+    make_cache_key,
+    reviews_version
+)
+from api.export import CONTENT_TYPES, RENDERERS, export_rows
+from api.filters import StableOrderingFilter, TitleFilter, title_facets
+from api.includes import INCLUDE_COMMENTS, embed_reviews, parse_includes
+from api.moderation import delete_content
+from api.mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    ListCreateDestroyViewSet,
+    NestedParentMixin,
+    SparseFieldsetQuerysetMixin
+)
+from api.pagination import (
+    AuthorFeedPagination, PubDatePagination, TitlePagination
+)
+from api.parsers import NDJSONParser
 from api.permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
-    IsAuthorModeratorAdminOrReadOnly
+    IsAuthorModeratorAdminOrReadOnly,
+    IsModeratorOrAdmin
 )
 from api.serializers import (
+    AuthorCommentSerializer,
+    AuthorReviewSerializer,
+    BulkDeleteSerializer,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
+    ReviewExportSerializer,
     ReviewSerializer,
+    TitleListSerializer,
     TitleReadSerializer,
     TitleWriteSerializer,
     UserSerializer,
     SignupSerializer,
     TokenSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.outbox import enqueue_email
 
 User = get_user_model()
 
@@ -49,11 +78,11 @@ class SignupView(APIView):
 
         confirmation_code = default_token_generator.make_token(user)
 
-        send_mail(
+        enqueue_email(
+            recipient=user.email,
             subject='Код подтверждения',
-            message=f'Ваш код подтверждения: {confirmation_code}',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
+            body=f'Ваш код подтверждения: {confirmation_code}',
+            dedupe_key=f'signup:{user.pk}'
         )
 
         return Response(
@@ -72,10 +101,20 @@ class TokenView(APIView):
         validated_data = serializer.validated_data
         user = validated_data['user']
 
-        token = AccessToken.for_user(user)
+        token = access_token_for(user)
         return Response({'token': str(token)})
 
 
+class BulkDeleteView(APIView):
+    permission_classes = (permissions.IsAuthenticated, IsModeratorOrAdmin)
+
+    def post(self, request):
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        summary = delete_content(**serializer.validated_data)
+        return Response(summary, status=status.HTTP_200_OK)
+
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -99,6 +138,10 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def get_or_update_me(self, request):
         user = request.user
+        if not isinstance(user, User):
+            # Снимок из кеша или claims токена не содержит профиля, поэтому
+            # профиль читается и сохраняется только из свежей записи БД.
+            user = get_object_or_404(User, pk=user.pk)
 
         if request.method == 'GET':
             serializer = self.get_serializer(user)
@@ -114,6 +157,51 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save(role=user.role)
         return Response(serializer.data)
 
+    def author_feed(self, queryset, serializer_class, count_field):
+        author = self.get_object()
+        page = self.paginate_queryset(queryset.filter(author=author))
+        serializer = serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        response = self.get_paginated_response(serializer.data)
+        # Общее число записей берётся из счётчика автора, без COUNT.
+        response.data = {
+            'count': getattr(author, count_field), **response.data
+        }
+        return response
+
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[permissions.AllowAny],
+        pagination_class=AuthorFeedPagination,
+        url_path='reviews',
+        url_name='reviews'
+    )
+    def reviews(self, request, username=None):
+        return self.author_feed(
+            Review.objects.select_related('author'),
+            AuthorReviewSerializer,
+            'review_count'
+        )
+
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[permissions.AllowAny],
+        pagination_class=AuthorFeedPagination,
+        url_path='comments',
+        url_name='comments'
+    )
+    def comments(self, request, username=None):
+        return self.author_feed(
+            Comment.objects.select_related('author').annotate(
+                title_id=F('review__title_id')
+            ),
+            AuthorCommentSerializer,
+            'comment_count'
+        )
+
 
 class CategoryViewSet(ListCreateDestroyViewSet):
     queryset = Category.objects.all()
@@ -127,66 +215,175 @@ class GenreViewSet(ListCreateDestroyViewSet):
     permission_classes = (IsAdminOrReadOnly,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('rating')
+class TitleViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
+    SparseFieldsetQuerysetMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
-    filter_backends = [DjangoFilterBackend]
+    pagination_class = TitlePagination
+    filter_backends = [DjangoFilterBackend, StableOrderingFilter]
     filterset_class = TitleFilter
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
     ordering_fields = ['name', 'year', 'rating']
     ordering = ['name']
+    cache_prefix = 'titles'
+    cache_stats = CacheStats()
+    select_related_fields = {'category': 'category'}
+    prefetch_related_fields = {'genre': 'genre'}
+    deferred_fields = {'description': 'description'}
+    version_name = CATALOG_VERSION
+
+    def get_version_name(self):
+        if self.includes:
+            # Встроенные отзывы и комментарии меняются без смены версии
+            # каталога: например, comment_count при новом комментарии.
+            return None
+        return super().get_version_name()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.includes = (
+            parse_includes(request) if self.action == 'retrieve' else set()
+        )
+
+    def get_queryset(self):
+        return self.sparse_queryset(super().get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if self.includes and response.status_code == status.HTTP_200_OK:
+            response.data['reviews'] = embed_reviews(
+                self.kwargs['pk'], INCLUDE_COMMENTS in self.includes
+            )
+        return response
 
     def get_serializer_class(self):
         if self.request.method in ['GET', 'HEAD', 'OPTIONS']:
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(detail=False, methods=['get'], url_path='facets')
+    def facets(self, request):
+        cache = get_api_cache()
+        key = make_cache_key(
+            'facets', get_version(CATALOG_VERSION), request.query_params
+        )
+        data = cache.get(key)
+        if data is None:
+            data = title_facets(
+                self.filter_queryset(Title.objects.all()),
+                by_decade=request.query_params.get('year_bucket') == 'decade'
+            )
+            cache.set(key, data, settings.TITLES_CACHE_TIMEOUT)
+        return Response(data)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        parser_classes=[JSONParser, NDJSONParser]
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается массив произведений.')
+        if len(items) > settings.TITLES_BULK_MAX_ITEMS:
+            raise ValidationError(
+                'За один запрос можно загрузить не больше '
+                f'{settings.TITLES_BULK_MAX_ITEMS} произведений.'
+            )
+        created, errors = create_titles(items)
+        return Response(
+            {'created': created, 'errors': errors},
+            status=(
+                status.HTTP_201_CREATED if created
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
+    def paginate_queryset(self, queryset):
+        if self.action == 'list':
+            # Список отдаётся быстрым путём TitleListSerializer из строк.
+            field_names = self.get_serializer().fields
+            queryset = queryset.prefetch_related(None).values(
+                *TitleListSerializer.get_columns(field_names)
+            )
+        return super().paginate_queryset(queryset)
+
+
+class ReviewViewSet(
+    ConditionalGetMixin,
+    NestedParentMixin,
+    SparseFieldsetQuerysetMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsAuthorModeratorAdminOrReadOnly
     )
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
+    ordering_fields = ['pub_date']
+    ordering = ['pub_date']
+    select_related_fields = {'author': 'author'}
+    deferred_fields = {'text': 'text'}
+    parent_model = Title
+    parent_field = 'title'
+    parent_lookups = {'pk': 'title_id'}
 
-    def get_review_title(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        return title
+    def get_version_name(self):
+        return reviews_version(self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        title = self.get_review_title()
-        queryset = title.reviews.all()
-        return queryset
-
-    def perform_create(self, serializer):
-        title = self.get_review_title()
-        serializer.save(author=self.request.user, title=title)
+        return self.sparse_queryset(super().get_queryset())
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, title_id=None):
+        params = ReviewExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data['output']
+        queryset = super().get_queryset()
+        if 'since' in params.validated_data:
+            queryset = queryset.filter(
+                pub_date__gte=params.validated_data['since']
+            )
+        response = StreamingHttpResponse(
+            RENDERERS[output](export_rows(queryset)),
+            content_type=CONTENT_TYPES[output]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="title-{title_id}-reviews.{output}"'
+        )
+        return response
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin,
+    NestedParentMixin,
+    SparseFieldsetQuerysetMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsAuthorModeratorAdminOrReadOnly
     )
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
+    ordering_fields = ['pub_date']
+    ordering = ['pub_date']
+    select_related_fields = {'author': 'author'}
+    deferred_fields = {'text': 'text'}
+    parent_model = Review
+    parent_field = 'review'
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
-    def get_comment_review(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, pk=review_id, title=title)
-        return review
+    def get_version_name(self):
+        return comments_version(self.kwargs.get('review_id'))
 
     def get_queryset(self):
-        review = self.get_comment_review()
-        queryset = review.comments.all()
-        return queryset
-
-    def perform_create(self, serializer):
-        review = self.get_comment_review()
-        serializer.save(author=self.request.user, review=review)
+        return self.sparse_queryset(super().get_queryset())
@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'users.apps.UsersConfig',
     'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
@@ -65,6 +66,45 @@ DATABASES = {
     }
 }
 
+# Кеш API должен быть общим для всех процессов: по нему сверяются версии
+# каталога, записанные другими процессами. Файловый кеш подходит для
+# разработки на одной машине; в production используйте Redis, например
+# {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#  'LOCATION': 'redis://127.0.0.1:6379/1'}.
+# При переполнении кеш удаляет случайные записи, в том числе ключи версий,
+# что сбрасывает все зависящие от них ответы, поэтому лимит записей
+# должен с запасом покрывать версии, ответы и пользователей.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
+API_CACHE_ALIAS = 'api'
+TITLES_CACHE_TIMEOUT = 300
+TITLES_BULK_MAX_ITEMS = 10000
+# Сколько отзывов и комментариев к каждому отдаёт ?include= в карточке
+# произведения.
+TITLE_INCLUDE_REVIEWS = 5
+TITLE_INCLUDE_COMMENTS = 3
+# Сколько секунд пользователь из JWT хранится в кеше API.
+AUTH_USER_CACHE_TIMEOUT = 60
+# Токены с ролью в claims: права проверяются без загрузки пользователя.
+# Смена роли отзывает такие токены, другие процессы узнают об этом
+# в пределах TOKEN_VERSION_CACHE_TIMEOUT секунд.
+JWT_ROLE_CLAIMS = False
+TOKEN_VERSION_CACHE_TIMEOUT = 30
+# Сколько проверенных токенов держать в памяти процесса.
+VERIFIED_TOKEN_CACHE_SIZE = 10000
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -83,7 +123,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -99,6 +139,16 @@ SIMPLE_JWT = {
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'no-reply@example.com'
 
+# Письма ставятся в очередь и отправляются командой send_outbox.
+# EMAIL_OUTBOX_EAGER отправляет их сразу в процессе запроса.
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повтором, секунд; удваивается с каждой попыткой.
+EMAIL_OUTBOX_RETRY_DELAY = 30
+# На сколько секунд забранная порция скрыта от других обработчиков.
+EMAIL_OUTBOX_LEASE = 300
+
 
 LANGUAGE_CODE = 'ru-RU'
 
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.search import index_titles
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс названий произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество произведений, обрабатываемых за один проход.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        indexed = 0
+        titles = Title.objects.order_by('pk').only('pk', 'name')
+        last_id = 0
+        while True:
+            batch = list(titles.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            index_titles(batch, batch_size)
+            last_id = batch[-1].pk
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано произведений: {indexed}.'
+        ))
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики рейтинга произведений по отзывам '
+        'и исправляет расхождения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество произведений, обрабатываемых за один проход.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не сохраняя.'
+        )
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        checked = fixed = 0
+        title_ids = Title.objects.order_by('pk').values_list('pk', flat=True)
+        last_id = 0
+        while True:
+            batch = list(title_ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1]
+            checked += len(batch)
+            fixed += self.reconcile(batch, dry_run)
+
+        action = 'Найдено' if dry_run else 'Исправлено'
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено произведений: {checked}. '
+            f'{action} расхождений: {fixed}.'
+        ))
+
+    def reconcile(self, title_ids, dry_run):
+        titles = Title.objects.filter(pk__in=title_ids).only(
+            *Title.rating_fields
+        )
+        with transaction.atomic():
+            if not dry_run:
+                # Строки произведений блокируются до подсчёта: отзыв,
+                # сохранённый параллельно, применит свою дельту после
+                # записи исправленных значений, а не будет ими затёрт.
+                titles = list(titles.select_for_update())
+            totals = {
+                row['title']: (row['total'], row['count'])
+                for row in Review.objects.filter(title__in=title_ids)
+                .order_by().values('title')
+                .annotate(total=Sum('score'), count=Count('id'))
+            }
+            drifted = []
+            for title in titles:
+                total, count = totals.get(title.pk, (0, 0))
+                expected = (total, count, total // count if count else None)
+                stored = tuple(
+                    getattr(title, field) for field in Title.rating_fields
+                )
+                if stored != expected:
+                    for field, value in zip(Title.rating_fields, expected):
+                        setattr(title, field, value)
+                    drifted.append(title)
+
+            if drifted and not dry_run:
+                Title.objects.bulk_update(drifted, Title.rating_fields)
+        return len(drifted)
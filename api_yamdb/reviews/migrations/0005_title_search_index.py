@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:28
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Копия reviews.search.tokenize на момент миграции."""
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return list(dict.fromkeys(TOKEN_RE.findall(text.replace('ё', 'е'))))
+
+
+def fill_search_index(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleSearchToken = apps.get_model('reviews', 'TitleSearchToken')
+    TitleSearchToken.objects.bulk_create(
+        (
+            TitleSearchToken(title_id=pk, token=token, position=position)
+            for pk, name in Title.objects.values_list('pk', 'name').iterator()
+            for position, token in enumerate(tokenize(name))
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_rating_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=256, verbose_name='Слово')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Позиция в названии')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс произведений',
+                'constraints': [models.UniqueConstraint(fields=('token', 'title'), name='unique_title_search_token')],
+            },
+        ),
+        migrations.RunPython(fill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:56
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comment_counts(apps, schema_editor):
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    counts = (
+        Comment.objects.order_by().values('review')
+        .annotate(count=Count('id'))
+    )
+    Review.objects.bulk_update(
+        [Review(pk=row['review'], comment_count=row['count'])
+         for row in counts],
+        ['comment_count'],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
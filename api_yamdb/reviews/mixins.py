@@ -0,0 +1,18 @@
+class CounterFieldsMixin:
+    """Полное сохранение модели без полей-счётчиков.
+
+    Поля из counter_fields меняются только UPDATE с F-выражениями, поэтому
+    save() без update_fields не должен затирать их устаревшими значениями
+    из экземпляра.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 from django.utils.text import Truncator
 
 from reviews.constants import (
@@ -8,6 +9,7 @@ from reviews.constants import (
     SCORE_MAX_VALUE,
     STR_TEXT_TRUNCATE_CHARS
 )
+from reviews.mixins import CounterFieldsMixin
 from reviews.validators import validate_film_year, validate_score
 
 
@@ -70,7 +72,25 @@ class Genre(NameSlugBaseModel):
         verbose_name_plural = 'Жанры'
 
 
-class Title(models.Model):
+class TitleQuerySet(models.QuerySet):
+
+    def apply_rating_delta(self, score_delta, count_delta):
+        """Сдвигает счётчики рейтинга одним UPDATE без чтения строк."""
+        return self.update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta,
+            rating=Case(
+                When(rating_count=-count_delta, then=Value(None)),
+                default=(
+                    (F('rating_sum') + score_delta)
+                    / (F('rating_count') + count_delta)
+                ),
+                output_field=models.PositiveSmallIntegerField()
+            )
+        )
+
+
+class Title(CounterFieldsMixin, models.Model):
     name = models.CharField(
         max_length=CHARFIELD_NAME_MAX_LENGTH,
         verbose_name='Название произведения',
@@ -102,17 +122,88 @@ class Title(models.Model):
         related_name='titles',
         help_text='Выберите категорию произведения'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг',
+        help_text='Средняя оценка, округлённая вниз'
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    # Счётчики рейтинга меняются только через apply_rating_delta.
+    rating_fields = ('rating_sum', 'rating_count', 'rating')
+    counter_fields = rating_fields
 
     class Meta:
         ordering = ['name']
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        # Сортировки списка произведений с id для однозначного порядка.
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            models.Index(fields=['year', 'id'], name='title_year_id_idx'),
+            models.Index(
+                fields=['rating', 'id'], name='title_rating_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Поисковый индекс обновляется в post_save в той же транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class TitleSearchToken(models.Model):
+    token = models.CharField(
+        max_length=CHARFIELD_NAME_MAX_LENGTH,
+        verbose_name='Слово'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='search_tokens',
+        verbose_name='Произведение'
+    )
+    position = models.PositiveSmallIntegerField(
+        verbose_name='Позиция в названии'
+    )
+
+    class Meta:
+        verbose_name = 'Слово поискового индекса'
+        verbose_name_plural = 'Поисковый индекс произведений'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['token', 'title'],
+                name='unique_title_search_token'
+            )
+        ]
+
+    def __str__(self):
+        return self.token
+
 
-class Review(TextAuthorPubDateModel):
+class ReviewQuerySet(models.QuerySet):
+
+    def apply_comment_delta(self, delta):
+        return self.update(comment_count=F('comment_count') + delta)
+
+
+class Review(CounterFieldsMixin, TextAuthorPubDateModel):
     title = models.ForeignKey(
         'Title',
         on_delete=models.CASCADE,
@@ -125,6 +216,16 @@ class Review(TextAuthorPubDateModel):
         verbose_name='Оценка',
         help_text=f'Оценка от {SCORE_MIN_VALUE} до {SCORE_MAX_VALUE}'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = ReviewQuerySet.as_manager()
+
+    # Счётчик комментариев меняется только сигналами комментариев.
+    counter_fields = ('comment_count',)
 
     class Meta(TextAuthorPubDateModel.Meta):
         verbose_name = 'Отзыв'
@@ -136,6 +237,22 @@ class Review(TextAuthorPubDateModel):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Счётчики рейтинга обновляются в post_save,
+        # поэтому держим их в одной транзакции с отзывом.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Comment(TextAuthorPubDateModel):
@@ -151,3 +268,13 @@ class Comment(TextAuthorPubDateModel):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
@@ -0,0 +1,74 @@
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from reviews.models import TitleSearchToken
+
+TOKEN_RE = re.compile(r'\w+')
+# Верхняя граница диапазона для поиска по префиксу через индекс.
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+def normalize(text):
+    """Приводит текст к поисковому виду: NFKC, casefold и ё -> е."""
+    return unicodedata.normalize('NFKC', text).casefold().replace('ё', 'е')
+
+
+def tokenize(text):
+    """Уникальные слова текста в порядке первого появления."""
+    return list(dict.fromkeys(TOKEN_RE.findall(normalize(text or ''))))
+
+
+def build_tokens(title):
+    return [
+        TitleSearchToken(title_id=title.pk, token=token, position=position)
+        for position, token in enumerate(tokenize(title.name))
+    ]
+
+
+def index_titles(titles, batch_size=1000, replace=True):
+    """Перестраивает поисковый индекс для переданных произведений.
+
+    Для только что созданных произведений передавайте replace=False:
+    удалять им нечего.
+    """
+    tokens = [token for title in titles for token in build_tokens(title)]
+    with transaction.atomic(savepoint=False):
+        if replace:
+            TitleSearchToken.objects.filter(
+                title__in=[title.pk for title in titles]
+            ).delete()
+        TitleSearchToken.objects.bulk_create(tokens, batch_size=batch_size)
+
+
+def prefix_match(token):
+    return Q(token__gte=token, token__lt=token + PREFIX_UPPER_BOUND)
+
+
+def filter_by_tokens(queryset, query):
+    """Произведения, в названии которых есть слова с каждым из префиксов."""
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+    for token in tokens:
+        queryset = queryset.filter(pk__in=TitleSearchToken.objects.filter(
+            prefix_match(token)
+        ).values('title'))
+    return queryset
+
+
+def search_titles(queryset, query):
+    """Поиск по индексу с сортировкой по релевантности.
+
+    Выше стоят произведения, где больше слов совпало с запросом целиком.
+    """
+    tokens = tokenize(query)
+    exact_matches = TitleSearchToken.objects.filter(
+        title=OuterRef('pk'), token__in=tokens
+    ).order_by().values('title').annotate(matches=Count('pk'))
+    return filter_by_tokens(queryset, query).annotate(
+        search_rank=Coalesce(Subquery(exact_matches.values('matches')), 0)
+    ).order_by('-search_rank', 'name', 'id')
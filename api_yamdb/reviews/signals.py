@@ -0,0 +1,225 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from reviews.models import Comment, Review, Title
+from reviews.search import index_titles
+
+User = get_user_model()
+
+# Счётчик пользователя, который ведётся для каждой модели записей.
+AUTHOR_COUNTERS = {Review: 'review_count', Comment: 'comment_count'}
+
+_bulk_state = threading.local()
+_cascade_state = threading.local()
+
+# Отправляется после сдвига comment_count; review_ids - id отзывов.
+comment_counts_changed = Signal()
+
+
+@contextmanager
+def bulk_mode():
+    """Отключает пересчёт счётчиков в сигналах удаления на время блока.
+
+    Для массовых операций: вызывающий код сам применяет суммарные
+    изменения счётчиков и версий кешей.
+    """
+    previous = in_bulk_mode()
+    _bulk_state.active = True
+    try:
+        yield
+    finally:
+        _bulk_state.active = previous
+
+
+def in_bulk_mode():
+    return getattr(_bulk_state, 'active', False)
+
+
+@receiver(pre_save, sender=Review)
+def load_review_rating(sender, instance, raw=False, **kwargs):
+    # Старые произведение и оценка читаются из БД с блокировкой строки
+    # в транзакции Review.save: у параллельных правок одного отзыва
+    # дельта считается от уже сохранённой оценки, а не от копии в памяти.
+    instance._rating_state = None
+    if raw or instance._state.adding:
+        return
+    instance._rating_state = Review.objects.select_for_update().filter(
+        pk=instance.pk
+    ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_title_id, old_score = instance._rating_state or (None, None)
+    if created or old_title_id is None:
+        Title.objects.filter(pk=instance.title_id).apply_rating_delta(
+            instance.score, 1
+        )
+    elif old_title_id != instance.title_id:
+        Title.objects.filter(pk=old_title_id).apply_rating_delta(
+            -old_score, -1
+        )
+        Title.objects.filter(pk=instance.title_id).apply_rating_delta(
+            instance.score, 1
+        )
+    elif old_score != instance.score:
+        Title.objects.filter(pk=instance.title_id).apply_rating_delta(
+            instance.score - old_score, 0
+        )
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, origin=None, **kwargs):
+    if in_bulk_mode() or (
+        isinstance(origin, Title) and origin.pk == instance.title_id
+    ):
+        return
+    Title.objects.filter(pk=instance.title_id).apply_rating_delta(
+        -instance.score, -1
+    )
+
+
+def shift_comment_counts(deltas):
+    """Сдвигает comment_count отзывов по словарю {id отзыва: изменение}."""
+    deltas = {review_id: delta for review_id, delta in deltas.items() if delta}
+    for review_id, delta in deltas.items():
+        Review.objects.filter(pk=review_id).apply_comment_delta(delta)
+    if deltas:
+        comment_counts_changed.send(sender=Review, review_ids=list(deltas))
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_review(sender, instance, **kwargs):
+    instance._counted_review_id = instance.__dict__.get('review_id')
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, created, raw=False,
+                                 **kwargs):
+    if raw:
+        return
+    old_review_id = instance._counted_review_id
+    if created:
+        shift_comment_counts({instance.review_id: 1})
+    elif old_review_id is not None and old_review_id != instance.review_id:
+        shift_comment_counts({old_review_id: -1, instance.review_id: 1})
+    instance._counted_review_id = instance.review_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, origin=None, **kwargs):
+    # Отзыв удаляется вместе с комментариями - обновлять его незачем.
+    if in_bulk_mode() or (
+        isinstance(origin, Review) and origin.pk == instance.review_id
+    ):
+        return
+    deltas = getattr(_cascade_state, 'comment_deltas', None)
+    if deltas is None or instance is origin:
+        shift_comment_counts({instance.review_id: -1})
+    else:
+        # Каскадное удаление: один UPDATE на отзыв в finish_cascade.
+        deltas[instance.review_id] -= 1
+
+
+def shift_author_count(field, author_id, delta):
+    User.objects.filter(pk=author_id).update(**{field: F(field) + delta})
+
+
+@receiver(post_init, sender=Review)
+@receiver(post_init, sender=Comment)
+def remember_counted_author(sender, instance, **kwargs):
+    instance._counted_author_id = instance.__dict__.get('author_id')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def update_author_count_on_save(sender, instance, created, raw=False,
+                                **kwargs):
+    if raw:
+        return
+    field = AUTHOR_COUNTERS[sender]
+    old_author_id = instance._counted_author_id
+    if created:
+        shift_author_count(field, instance.author_id, 1)
+    elif old_author_id is not None and old_author_id != instance.author_id:
+        shift_author_count(field, old_author_id, -1)
+        shift_author_count(field, instance.author_id, 1)
+    instance._counted_author_id = instance.author_id
+
+
+@receiver(pre_delete, sender=User)
+@receiver(pre_delete, sender=Title)
+@receiver(pre_delete, sender=Review)
+def start_cascade(sender, instance, origin=None, **kwargs):
+    if instance is origin:
+        _cascade_state.author_deltas = Counter()
+        _cascade_state.comment_deltas = Counter()
+        _cascade_state.deleted_reviews = set()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+def finish_cascade(sender, instance, origin=None, **kwargs):
+    if instance is not origin:
+        return
+    deltas = getattr(_cascade_state, 'author_deltas', None) or {}
+    comment_deltas = getattr(_cascade_state, 'comment_deltas', None) or {}
+    deleted_reviews = getattr(_cascade_state, 'deleted_reviews', None) or ()
+    _cascade_state.author_deltas = None
+    _cascade_state.comment_deltas = None
+    _cascade_state.deleted_reviews = None
+    for (field, author_id), delta in deltas.items():
+        shift_author_count(field, author_id, delta)
+    # Отзывам, удалённым в том же каскаде, счётчик уже не нужен.
+    shift_comment_counts({
+        review_id: delta for review_id, delta in comment_deltas.items()
+        if review_id not in deleted_reviews
+    })
+
+
+@receiver(post_delete, sender=Review)
+def remember_deleted_review(sender, instance, origin=None, **kwargs):
+    deleted_reviews = getattr(_cascade_state, 'deleted_reviews', None)
+    if deleted_reviews is not None and instance is not origin:
+        deleted_reviews.add(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def update_author_count_on_delete(sender, instance, origin=None, **kwargs):
+    # Удаляемому вместе с записями пользователю счётчики не нужны.
+    if in_bulk_mode() or (
+        isinstance(origin, User) and origin.pk == instance.author_id
+    ):
+        return
+    field = AUTHOR_COUNTERS[sender]
+    deltas = getattr(_cascade_state, 'author_deltas', None)
+    if deltas is None or instance is origin:
+        shift_author_count(field, instance.author_id, -1)
+    else:
+        # Каскадное удаление: один UPDATE на автора в finish_cascade.
+        deltas[field, instance.author_id] -= 1
+
+
+@receiver(post_init, sender=Title)
+def remember_indexed_name(sender, instance, **kwargs):
+    instance._indexed_name = instance.__dict__.get('name')
+
+
+@receiver(post_save, sender=Title)
+def update_search_index(sender, instance, created, raw=False, **kwargs):
+    if raw or not created and instance._indexed_name == instance.name:
+        return
+    index_titles([instance], replace=not created)
+    instance._indexed_name = instance.name
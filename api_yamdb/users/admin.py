@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -19,3 +19,13 @@ class UserAdmin(BaseUserAdmin):
             'role', 'bio', 'first_name', 'last_name'
         )}),
     )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'recipient', 'subject', 'status', 'attempts', 'created_at',
+        'sent_at'
+    )
+    search_fields = ('recipient',)
+    list_filter = ('status',)
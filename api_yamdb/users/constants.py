@@ -2,3 +2,16 @@
 EMAIL_MAX_LENGTH = 254
 ROLE_MAX_LENGTH = 20
 USERNAME_MAX_LENGTH = 150
+
+# Очередь исходящих писем
+EMAIL_SUBJECT_MAX_LENGTH = 255
+DEDUPE_KEY_MAX_LENGTH = 100
+OUTBOX_STATUS_MAX_LENGTH = 10
+OUTBOX_PENDING = 'pending'
+OUTBOX_SENT = 'sent'
+OUTBOX_FAILED = 'failed'
+OUTBOX_STATUS_CHOICES = (
+    (OUTBOX_PENDING, 'Ожидает отправки'),
+    (OUTBOX_SENT, 'Отправлено'),
+    (OUTBOX_FAILED, 'Не доставлено'),
+)
@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from users.outbox import claim_batch, deliver
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди порциями. Каждый обработчик '
+        'использует одно SMTP-соединение на порцию.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество параллельных обработчиков.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Количество писем в порции (EMAIL_OUTBOX_BATCH_SIZE).'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза в секундах, если очередь пуста.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Завершиться, когда в очереди не останется готовых писем.'
+        )
+
+    def handle(self, *args, workers, batch_size, interval, once, **options):
+        self.stop = threading.Event()
+        if workers == 1:
+            results = [self.work(batch_size, interval, once)]
+        else:
+            with ThreadPoolExecutor(workers) as pool:
+                futures = [
+                    pool.submit(self.threaded_work, batch_size, interval, once)
+                    for _ in range(workers)
+                ]
+                try:
+                    results = [future.result() for future in futures]
+                except KeyboardInterrupt:
+                    self.stop.set()
+                    results = [future.result() for future in futures]
+        sent = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {sent}. Ошибок отправки: {failed}.'
+        ))
+
+    def work(self, batch_size, interval, once):
+        sent = failed = 0
+        try:
+            while not self.stop.is_set():
+                emails = claim_batch(batch_size)
+                if not emails:
+                    if once:
+                        break
+                    self.stop.wait(interval)
+                    continue
+                batch_sent, batch_failed = deliver(emails)
+                sent += batch_sent
+                failed += batch_failed
+        except KeyboardInterrupt:
+            self.stop.set()
+        return sent, failed
+
+    def threaded_work(self, batch_size, interval, once):
+        try:
+            return self.work(batch_size, interval, once)
+        finally:
+            connection.close()
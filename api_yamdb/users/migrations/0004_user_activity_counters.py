@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:16
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_activity_counters(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    counters = {}
+    for model, field in ((Review, 'review_count'), (Comment, 'comment_count')):
+        for row in model.objects.order_by().values('author').annotate(
+            count=Count('id')
+        ):
+            counters.setdefault(row['author'], {})[field] = row['count']
+    User.objects.bulk_update(
+        [User(pk=pk, review_count=values.get('review_count', 0),
+              comment_count=values.get('comment_count', 0))
+         for pk, values in counters.items()],
+        ['review_count', 'comment_count'],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_user_username'),
+        ('reviews', '0009_review_comment_author_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество отзывов'),
+        ),
+        migrations.RunPython(
+            fill_activity_counters, migrations.RunPython.noop
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import RegexValidator
+from django.utils import timezone
 
 from reviews.constants import (
     USERNAME_MAX_LENGTH,
@@ -12,10 +13,18 @@ from reviews.constants import (
     ADMIN,
     USERNAME_REGEX
 )
+from reviews.mixins import CounterFieldsMixin
+from users.constants import (
+    DEDUPE_KEY_MAX_LENGTH,
+    EMAIL_SUBJECT_MAX_LENGTH,
+    OUTBOX_PENDING,
+    OUTBOX_STATUS_CHOICES,
+    OUTBOX_STATUS_MAX_LENGTH
+)
 from users.validators import validate_username_not_me
 
 
-class User(AbstractUser):
+class User(CounterFieldsMixin, AbstractUser):
     username = models.CharField(
         max_length=USERNAME_MAX_LENGTH,
         unique=True,
@@ -50,6 +59,27 @@ class User(AbstractUser):
         verbose_name='био'
     )
 
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='количество отзывов'
+    )
+
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='количество комментариев'
+    )
+
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='версия токенов'
+    )
+
+    # Счётчики и версия токенов меняются только сигналами.
+    counter_fields = ('review_count', 'comment_count', 'token_version')
+
     class Meta:
         ordering = ('username',)
         verbose_name = 'Пользователь'
@@ -71,3 +101,71 @@ class User(AbstractUser):
             self.is_authenticated
             and self.role == MODERATOR
         )
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Пока письмо не отправлено, dedupe_key не даёт поставить в очередь
+    второе такое же: повторная постановка обновляет текст существующего.
+    """
+
+    recipient = models.EmailField(
+        max_length=EMAIL_MAX_LENGTH,
+        verbose_name='получатель'
+    )
+    subject = models.CharField(
+        max_length=EMAIL_SUBJECT_MAX_LENGTH,
+        verbose_name='тема'
+    )
+    body = models.TextField(verbose_name='текст')
+    dedupe_key = models.CharField(
+        max_length=DEDUPE_KEY_MAX_LENGTH,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='ключ дедупликации'
+    )
+    status = models.CharField(
+        max_length=OUTBOX_STATUS_MAX_LENGTH,
+        choices=OUTBOX_STATUS_CHOICES,
+        default=OUTBOX_PENDING,
+        verbose_name='статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='попытки'
+    )
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='доступно для отправки с'
+    )
+    claim = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name='метка обработчика'
+    )
+    last_error = models.TextField(blank=True, verbose_name='последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='создано'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='отправлено'
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=('status', 'available_at', 'id'),
+                name='outbox_status_available_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,126 @@
+import uuid
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from users.constants import OUTBOX_FAILED, OUTBOX_PENDING, OUTBOX_SENT
+from users.models import OutgoingEmail
+
+UPSERT_FIELDS = (
+    'recipient', 'subject', 'body', 'status', 'attempts', 'available_at',
+    'claim', 'last_error'
+)
+
+
+def enqueue_email(recipient, subject, body, dedupe_key=None):
+    """Ставит письмо в очередь одним запросом и сразу возвращает его.
+
+    Письмо с dedupe_key, ещё не отправленное, заменяется новым текстом.
+    При EMAIL_OUTBOX_EAGER письмо отправляется сразу, в этом же процессе.
+    """
+    email = OutgoingEmail(
+        recipient=recipient, subject=subject, body=body,
+        dedupe_key=dedupe_key
+    )
+    if dedupe_key is None:
+        email.save()
+    else:
+        OutgoingEmail.objects.bulk_create(
+            [email], update_conflicts=True, unique_fields=['dedupe_key'],
+            update_fields=UPSERT_FIELDS
+        )
+    if settings.EMAIL_OUTBOX_EAGER:
+        deliver([email])
+    return email
+
+
+def claim_batch(batch_size=None):
+    """Забирает порцию писем, готовых к отправке.
+
+    Забранные письма скрыты от других обработчиков на EMAIL_OUTBOX_LEASE
+    секунд; если обработчик упал, письма снова станут доступны.
+    """
+    now = timezone.now()
+    claim = uuid.uuid4()
+    ready = OutgoingEmail.objects.filter(
+        status=OUTBOX_PENDING, available_at__lte=now
+    )
+    ids = ready.order_by('available_at', 'id').values('pk')[
+        :batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    ]
+    ready.filter(pk__in=ids).update(
+        claim=claim,
+        available_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    )
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def deliver(emails, connection=None):
+    """Отправляет письма через одно соединение и отмечает результат.
+
+    Неудачные попытки откладываются с растущей задержкой, после
+    EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо считается недоставленным.
+    """
+    connection = connection or get_connection()
+    sent, failed = [], []
+    with connection:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[email.recipient],
+                connection=connection
+            )
+            try:
+                message.send()
+            except (SMTPException, OSError) as error:
+                # Следующее письмо откроет соединение заново.
+                connection.close()
+                email.last_error = str(error) or type(error).__name__
+                failed.append(email)
+            else:
+                sent.append(email)
+
+    # Результат записывается только в строки, всё ещё забранные этой
+    # порцией: письмо, заменённое новым текстом во время отправки,
+    # остаётся в очереди.
+    now = timezone.now()
+    for claim, emails in group_by_claim(sent).items():
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails], claim=claim
+        ).update(
+            status=OUTBOX_SENT, sent_at=now, dedupe_key=None, claim=None,
+            last_error=''
+        )
+    for email in failed:
+        email.attempts += 1
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OUTBOX_FAILED
+            email.dedupe_key = None
+        else:
+            email.available_at = now + retry_delay(email.attempts)
+    for claim, emails in group_by_claim(failed).items():
+        for email in emails:
+            email.claim = None
+        OutgoingEmail.objects.filter(claim=claim).bulk_update(emails, [
+            'attempts', 'claim', 'status', 'dedupe_key', 'available_at',
+            'last_error'
+        ])
+    return len(sent), len(failed)
+
+
+def group_by_claim(emails):
+    groups = {}
+    for email in emails:
+        groups.setdefault(email.claim, []).append(email)
+    return groups
@@ -1,6 +1,10 @@
 import os
 import sys
 
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
@@ -28,4 +32,38 @@ if FILENAME not in project_dir_content:
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_catalog',
 ]
+
+
+def pytest_configure(config):
+    # Кеш API в памяти: тесты не пишут файловый кеш в каталог проекта.
+    settings.CACHES['api'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api',
+    }
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(
+    django_db_modify_db_settings_parallel_suffix, tmp_path_factory
+):
+    # Тестовая БД в файле: in-memory SQLite в режиме shared cache не ждёт
+    # снятия блокировки, и параллельные запросы падают с ошибкой.
+    database = settings.DATABASES['default']
+    database['TEST']['NAME'] = str(
+        tmp_path_factory.mktemp('db') / 'test.sqlite3'
+    )
+    database['OPTIONS'].setdefault('timeout', 20)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def email_outbox_eager(settings):
+    # Тесты регистрации проверяют mail.outbox сразу после запроса.
+    settings.EMAIL_OUTBOX_EAGER = True
@@ -0,0 +1,40 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Фильм', slug='films')
+
+
+@pytest.fixture
+def genres():
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def make_title(category):
+    """Создаёт произведение; по умолчанию - в категории `category`."""
+    def make(name='Произведение', year=2000, genres=(), **fields):
+        fields.setdefault('category', category)
+        title = Title.objects.create(name=name, year=year, **fields)
+        if genres:
+            title.genre.set(genres)
+        return title
+    return make
+
+
+@pytest.fixture
+def make_authors(django_user_model):
+    def make(count, start=0):
+        return [
+            django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(start, start + count)
+        ]
+    return make
@@ -0,0 +1,113 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    REVIEW_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{id}/'
+
+    @staticmethod
+    def get_counters(title_id):
+        return Title.objects.values_list(
+            'rating_sum', 'rating_count', 'rating'
+        ).get(pk=title_id)
+
+    def test_01_counters_follow_reviews(self, admin_client, admin, user,
+                                        user_client, moderator,
+                                        moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_counters(title_id) == (10, 2, 5), (
+            'Проверьте, что при создании отзыва счётчики рейтинга '
+            'произведения увеличиваются.'
+        )
+
+        create_single_review(moderator_client, title_id, 'text', 2)
+        assert self.get_counters(title_id) == (12, 3, 4)
+
+        user_review = next(
+            review for review in reviews if review['author'] == user.username
+        )
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, id=user_review['id']
+        )
+        user_client.patch(url, data={'score': 9})
+        assert self.get_counters(title_id) == (16, 3, 5), (
+            'Проверьте, что при изменении оценки счётчики рейтинга '
+            'произведения пересчитываются.'
+        )
+
+        user_client.delete(url)
+        assert self.get_counters(title_id) == (7, 2, 3), (
+            'Проверьте, что при удалении отзыва счётчики рейтинга '
+            'произведения уменьшаются.'
+        )
+
+        moderator.delete()
+        admin.delete()
+        assert self.get_counters(title_id) == (0, 0, None), (
+            'Проверьте, что при каскадном удалении отзывов счётчики '
+            'рейтинга произведения обнуляются.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, admin,
+                                            user, user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=1, rating_count=7, rating=0
+        )
+        Review.objects.filter(author=user).update(score=1)
+
+        out = StringIO()
+        call_command('recalculate_ratings', '--dry-run', stdout=out)
+        assert self.get_counters(title_id) == (1, 7, 0)
+        assert 'Найдено расхождений: 1' in out.getvalue()
+
+        call_command('recalculate_ratings', stdout=StringIO())
+        assert self.get_counters(title_id) == (6, 2, 3), (
+            'Проверьте, что команда `recalculate_ratings` исправляет '
+            'счётчики рейтинга.'
+        )
+
+    def test_03_title_save_keeps_counters(self, admin_client, admin, user,
+                                          user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        counters = self.get_counters(title.pk)
+        title.rating_sum = title.rating_count = 0
+        title.name = 'Другое название'
+        title.save()
+        assert self.get_counters(title.pk) == counters, (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'счётчики рейтинга устаревшими значениями.'
+        )
+        assert Title.objects.get(pk=title.pk).name == 'Другое название'
+
+    def test_04_overlapping_review_edits(self, admin_client, admin, user,
+                                         user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        first, second = (Review.objects.get(author=user) for _ in range(2))
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        assert self.get_counters(title_id) == (14, 2, 7), (
+            'Проверьте, что изменение оценки считает дельту от оценки '
+            'в БД, а не от загруженной ранее копии отзыва.'
+        )
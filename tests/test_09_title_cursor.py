@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import make_cursor
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleCursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, make_title):
+        ratings = [None, 7, 3, 7, None, 10, 3]
+        for idx, rating in enumerate(ratings):
+            make_title(
+                name=f'Произведение {idx % 3}',
+                year=1990 + idx % 2,
+                rating=rating
+            )
+
+    def walk(self, client, url, direction):
+        ids = []
+        pages = 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации эндпоинт '
+                f'`{self.TITLES_URL}` не считает общее количество объектов.'
+            )
+            page_ids = [title['id'] for title in data['results']]
+            ids = page_ids + ids if direction == 'previous' else ids + page_ids
+            url = data[direction]
+            pages += 1
+        return ids, pages, data
+
+    @pytest.mark.parametrize(
+        'ordering',
+        ['name', '-name', 'year', '-year', 'rating', '-rating']
+    )
+    def test_01_cursor_walk(self, client, titles, ordering):
+        field = ordering.lstrip('-')
+        expected = list(
+            Title.objects.order_by(
+                ordering, '-id' if ordering.startswith('-') else 'id'
+            ).values_list('id', flat=True)
+        )
+        url = (
+            f'{self.TITLES_URL}?pagination=cursor&limit=2&ordering={ordering}'
+        )
+        ids, pages, last_page = self.walk(client, url, 'next')
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация эндпоинта '
+            f'`{self.TITLES_URL}` при сортировке по `{field}` возвращает '
+            'все произведения без пропусков и повторов.'
+        )
+        assert pages == 4
+
+        back_ids, _, _ = self.walk(client, last_page['previous'], 'previous')
+        assert back_ids == expected[:-1], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведёт '
+            'на предыдущие страницы.'
+        )
+
+    def test_02_limit_offset_kept(self, client, titles):
+        response = client.get(f'{self.TITLES_URL}?limit=2&offset=2')
+        data = response.json()
+        assert data['count'] == Title.objects.count()
+        assert len(data['results']) == 2
+
+    def test_03_invalid_cursor(self, client, titles):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('payload', [
+        {'p': ['abc', 1], 'o': 'year'},
+        {'p': [[1], 1], 'o': 'year'},
+        {'p': [{'x': 1}, 1], 'o': 'name'},
+        {'p': ['Произведение 1', 'abc'], 'o': 'name'},
+        {'p': ['Произведение 1', None], 'o': 'name'},
+    ])
+    def test_04_tampered_cursor(self, client, titles, payload):
+        url = (
+            f'{self.TITLES_URL}?ordering={payload["o"]}'
+            f'&cursor={make_cursor(payload)}'
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что курсор с некорректной позицией {payload["p"]} '
+            'отклоняется ответом со статусом 404.'
+        )
+
+    def test_05_search_not_paginated_by_cursor(self, client, titles):
+        response = client.get(
+            f'{self.TITLES_URL}?search=произведение&pagination=cursor'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что поиск с курсорной пагинацией отклоняется, '
+            'а не теряет сортировку по релевантности.'
+        )
+        assert 'search' in response.json()
+        response = client.get(f'{self.TITLES_URL}?search=произведение')
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,186 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+PAGE_OBJECTS_COUNT = 5
+
+# (метод, URL, клиент, данные, ожидаемый статус, число SQL-запросов)
+QUERY_BUDGETS = [
+    ('get', '/api/v1/categories/', 'client', None, HTTPStatus.OK, 2),
+    ('post', '/api/v1/categories/', 'admin_client',
+     {'name': 'Музыка', 'slug': 'music'}, HTTPStatus.CREATED, 3),
+    ('delete', '/api/v1/categories/{category}/', 'admin_client', None,
+     HTTPStatus.NO_CONTENT, 6),
+    ('get', '/api/v1/genres/', 'client', None, HTTPStatus.OK, 2),
+    ('post', '/api/v1/genres/', 'admin_client',
+     {'name': 'Мюзикл', 'slug': 'musical'}, HTTPStatus.CREATED, 3),
+    ('delete', '/api/v1/genres/{genre}/', 'admin_client', None,
+     HTTPStatus.NO_CONTENT, 6),
+    ('get', '/api/v1/titles/', 'client', None, HTTPStatus.OK, 3),
+    ('get', '/api/v1/titles/{title}/', 'client', None, HTTPStatus.OK, 2),
+    ('post', '/api/v1/titles/', 'admin_client',
+     {'name': 'Новое', 'year': 2000, 'category': 'films',
+      'genre': ['drama']}, HTTPStatus.CREATED, 13),
+    ('patch', '/api/v1/titles/{title}/', 'admin_client',
+     {'name': 'Другое'}, HTTPStatus.OK, 8),
+    ('delete', '/api/v1/titles/{title}/', 'admin_client', None,
+     HTTPStatus.NO_CONTENT, 17),
+    ('get', '/api/v1/titles/{title}/reviews/', 'client', None,
+     HTTPStatus.OK, 3),
+    ('get', '/api/v1/titles/{title}/reviews/{review}/', 'client', None,
+     HTTPStatus.OK, 1),
+    ('post', '/api/v1/titles/{title}/reviews/', 'moderator_client',
+     {'text': 'Отзыв', 'score': 5}, HTTPStatus.CREATED, 7),
+    ('patch', '/api/v1/titles/{title}/reviews/{review}/', 'user_client',
+     {'score': 1}, HTTPStatus.OK, 7),
+    ('delete', '/api/v1/titles/{title}/reviews/{review}/', 'user_client',
+     None, HTTPStatus.NO_CONTENT, 10),
+    ('get', '/api/v1/titles/{title}/reviews/{review}/comments/', 'client',
+     None, HTTPStatus.OK, 3),
+    ('get', '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+     'client', None, HTTPStatus.OK, 1),
+    ('post', '/api/v1/titles/{title}/reviews/{review}/comments/',
+     'user_client', {'text': 'Комментарий'}, HTTPStatus.CREATED, 6),
+    ('patch', '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+     'user_client', {'text': 'Другой'}, HTTPStatus.OK, 3),
+    ('delete', '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+     'user_client', None, HTTPStatus.NO_CONTENT, 8),
+    ('get', '/api/v1/users/', 'admin_client', None, HTTPStatus.OK, 3),
+    ('get', '/api/v1/users/{username}/', 'admin_client', None,
+     HTTPStatus.OK, 2),
+    ('post', '/api/v1/users/', 'admin_client',
+     {'username': 'new_user', 'email': 'new_user@yamdb.fake'},
+     HTTPStatus.CREATED, 4),
+    ('patch', '/api/v1/users/{username}/', 'admin_client',
+     {'bio': 'Новое био'}, HTTPStatus.OK, 3),
+    ('delete', '/api/v1/users/{username}/', 'admin_client', None,
+     HTTPStatus.NO_CONTENT, 14),
+    ('get', '/api/v1/users/me/', 'user_client', None, HTTPStatus.OK, 1),
+    ('patch', '/api/v1/users/me/', 'user_client',
+     {'bio': 'Новое био'}, HTTPStatus.OK, 2),
+    ('post', '/api/v1/auth/signup/', 'client',
+     {'username': 'signup_user', 'email': 'signup@yamdb.fake'},
+     HTTPStatus.OK, 8),
+    ('post', '/api/v1/auth/token/', 'client',
+     {'username': '{username}', 'confirmation_code': '{confirmation_code}'},
+     HTTPStatus.OK, 1),
+    ('get', '/api/v1/titles/facets/', 'client', None, HTTPStatus.OK, 4),
+    ('post', '/api/v1/titles/bulk/', 'admin_client',
+     [{'name': f'Загрузка {idx}', 'year': 2000, 'category': 'films',
+       'genre': ['drama']} for idx in range(PAGE_OBJECTS_COUNT)],
+     HTTPStatus.CREATED, 8),
+    ('get', '/api/v1/titles/{title}/reviews/export/', 'client', None,
+     HTTPStatus.OK, 2),
+    ('post', '/api/v1/moderation/delete/', 'moderator_client',
+     {'author': '{username}'}, HTTPStatus.OK, 24),
+    ('get', '/api/v1/users/{username}/reviews/', 'client', None,
+     HTTPStatus.OK, 2),
+    ('get', '/api/v1/users/{username}/comments/', 'client', None,
+     HTTPStatus.OK, 2),
+]
+
+
+def format_data(data, values):
+    """Подставляет значения каталога в строки данных запроса."""
+    if isinstance(data, dict):
+        return {key: format_data(item, values) for key, item in data.items()}
+    if isinstance(data, list):
+        return [format_data(item, values) for item in data]
+    if isinstance(data, str):
+        return data.format(**values)
+    return data
+
+
+@pytest.fixture
+def catalog(user, admin, category, genres, make_title, make_authors):
+    titles = [
+        make_title(name=f'Произведение {idx}', genres=genres)
+        for idx in range(PAGE_OBJECTS_COUNT)
+    ]
+    reviews = [Review.objects.create(
+        title=titles[0], author=user, text='Отзыв', score=5
+    )]
+    reviews.extend(
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=7
+        )
+        for author in (admin, *make_authors(PAGE_OBJECTS_COUNT - 2))
+    )
+    comments = [
+        Comment.objects.create(review=reviews[0], author=user, text='text')
+        for _ in range(PAGE_OBJECTS_COUNT)
+    ]
+    return {
+        'category': category.slug,
+        'genre': genres[0].slug,
+        'title': titles[0].pk,
+        'review': reviews[0].pk,
+        'comment': comments[0].pk,
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryBudget:
+
+    @pytest.mark.parametrize(
+        'method,url,client_name,data,status,expected', QUERY_BUDGETS
+    )
+    def test_01_endpoint_query_budget(self, request, catalog, method, url,
+                                      client_name, data, status, expected):
+        client = request.getfixturevalue(client_name)
+        url = url.format(**catalog)
+        data = format_data(data, catalog)
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url, data=data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+        assert response.status_code == status, response.content
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        assert len(context) == expected, (
+            f'Проверьте количество SQL-запросов при {method.upper()}-запросе '
+            f'к `{url}`: ожидалось {expected}, выполнено {len(context)}.\n'
+            f'{queries}'
+        )
+
+    def test_02_titles_list_independent_of_page_size(self, client, catalog):
+        counts = []
+        for limit in (1, PAGE_OBJECTS_COUNT):
+            with CaptureQueriesContext(connection) as context:
+                client.get(f'/api/v1/titles/?limit={limit}')
+            counts.append(len(context))
+        assert counts[0] == counts[1], (
+            'Проверьте, что количество SQL-запросов к `/api/v1/titles/` '
+            'не зависит от размера страницы.'
+        )
+
+    def test_03_nested_routes_check_parents(self, user_client, catalog):
+        other_title = Title.objects.exclude(pk=catalog['title']).first().pk
+        base = f'/api/v1/titles/{other_title}/reviews/{catalog["review"]}/'
+        requests = [
+            ('get', base, None),
+            ('get', f'{base}comments/', None),
+            ('get', f'{base}comments/{catalog["comment"]}/', None),
+            ('post', f'{base}comments/', {'text': 'Комментарий'}),
+            ('patch', f'{base}comments/{catalog["comment"]}/',
+             {'text': 'Другой'}),
+        ]
+        # Пользователь из токена кешируется после первого запроса.
+        user_client.get('/api/v1/users/me/')
+        for method, url, data in requests:
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(user_client, method)(url, data=data)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что {method.upper()}-запрос к `{url}` с отзывом '
+                'другого произведения возвращает ответ со статусом 404.'
+            )
+            assert len(context) == 1, (
+                f'Проверьте, что при {method.upper()}-запросе к `{url}` '
+                'родительские объекты проверяются одним SQL-запросом.'
+            )
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import cache
+from api.views import TitleViewSet
+from reviews.models import Comment, Genre, Review
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleListCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response, len(context)
+
+    def test_01_cache_hit_and_invalidation(self, admin_client, client,
+                                           user_client):
+        titles, _, genres = create_titles(admin_client)
+        stats = TitleViewSet.cache_stats
+        stats.reset()
+        url = f'{self.TITLES_URL}?genre={genres[2]["slug"]}&limit=5'
+
+        first, _ = self.get(client, url)
+        second, queries = self.get(
+            client, f'{self.TITLES_URL}?limit=5&genre={genres[2]["slug"]}'
+        )
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert queries == 0, (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'с теми же параметрами отдаётся из кеша без запросов к БД.'
+        )
+        assert second.json() == first.json()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+        create_single_review(user_client, titles[1]['id'], 'text', 8)
+        third, _ = self.get(client, url)
+        assert third['X-Cache'] == 'MISS', (
+            'Проверьте, что создание отзыва сбрасывает кеш списка '
+            'произведений.'
+        )
+        assert third.json()['results'][0]['rating'] == 8
+
+        Genre.objects.filter(slug=genres[2]['slug']).first().delete()
+        fourth, _ = self.get(client, url)
+        assert fourth['X-Cache'] == 'MISS'
+        assert fourth.json()['count'] == 0
+
+    def test_02_cascade_bumps_versions_once(self, user, make_title):
+        titles = [make_title(name=f'Произведение {idx}') for idx in range(3)]
+        for title in titles:
+            review = Review.objects.create(
+                title=title, author=user, text='Отзыв', score=5
+            )
+            Comment.objects.create(review=review, author=user, text='text')
+
+        with mock.patch.object(
+            cache, 'bump_versions', wraps=cache.bump_versions
+        ) as bump_versions:
+            user.delete()
+        assert bump_versions.call_count == 1, (
+            'Проверьте, что каскадное удаление записывает версии в кеш '
+            'одной операцией после коммита.'
+        )
+        names = set(bump_versions.call_args.args[0])
+        assert {cache.CATALOG_VERSION} | {
+            cache.reviews_version(title.pk) for title in titles
+        } <= names
+
+    def test_03_cache_key_includes_host(self, admin_client, client):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?limit=1'
+        for host in ('a.example', 'b.example'):
+            response = client.get(url, HTTP_HOST=host)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['next'].startswith(f'http://{host}/'), (
+                'Проверьте, что кеш списка произведений не отдаёт ссылки '
+                'пагинации с хостом другого запроса.'
+            )
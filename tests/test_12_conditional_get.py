@@ -0,0 +1,135 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from api.cache import CATALOG_VERSION, get_api_cache, version_key
+
+from tests.utils import (
+    create_comments, create_single_comment, create_single_review,
+    create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def assert_not_modified(self, client, url, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, **headers)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что условный GET-запрос к `{url}` для неизменённых '
+            'данных возвращает ответ со статусом 304.'
+        )
+        assert len(context) == 0, (
+            f'Проверьте, что ответ 304 на GET-запрос к `{url}` отдаётся '
+            'без запросов к БД.'
+        )
+
+    def test_01_reviews_and_comments(self, client, admin_client, admin, user,
+                                     user_client, moderator_client):
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        for url in (reviews_url, f'{reviews_url}{reviews[0]["id"]}/',
+                    comments_url):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag')
+            self.assert_not_modified(
+                client, url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+
+        etag = client.get(reviews_url)['ETag']
+        create_single_review(moderator_client, titles[0]['id'], 'text', 3)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после создания отзыва условный GET-запрос '
+            f'к `{reviews_url}` возвращает актуальные данные.'
+        )
+        assert response.json()['count'] == 3
+
+        etag = client.get(comments_url)['ETag']
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'text'
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 3
+
+    def set_catalog_version(self, version):
+        get_api_cache().set(
+            version_key(CATALOG_VERSION), version, timeout=None
+        )
+
+    def test_02_title_detail(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        self.set_catalog_version(time.time_ns() - 2 * 10 ** 9)
+        response = client.get(url)
+        assert response.has_header('Last-Modified')
+        self.assert_not_modified(
+            client, url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+
+        etag = response['ETag']
+        admin_client.patch(url, data={'name': 'Новое название'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое название'
+
+    def test_03_same_second_version(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        self.set_catalog_version(time.time_ns())
+        response = client.get(url)
+        assert response.has_header('ETag')
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что для версии из текущей секунды заголовок '
+            '`Last-Modified` не отдаётся: запись в ту же секунду его '
+            'не сдвинет.'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_author_rename(self, client, admin_client, admin, user,
+                              user_client):
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что смена имени пользователя меняет ETag '
+                f'`{url}`: имя автора входит в ответ.'
+            )
+            assert 'renamed' in {
+                item['author'] for item in response.json()['results']
+            }
@@ -0,0 +1,73 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Title, TitleSearchToken
+from reviews.search import search_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        names = [
+            'Ёжик в тумане',
+            'ЕЖИК и медвежонок',
+            'Туманность Андромеды',
+            'Война и мир',
+        ]
+        return {
+            name: Title.objects.create(name=name, year=1975) for name in names
+        }
+
+    def search(self, client, query, param='search'):
+        response = client.get(self.TITLES_URL, {param: query})
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_case_folding_and_yo(self, client, titles):
+        expected = ['Ёжик в тумане', 'ЕЖИК и медвежонок']
+        assert sorted(self.search(client, 'ежик')) == expected, (
+            'Проверьте, что поиск по параметру `search` не зависит от '
+            'регистра кириллицы и не различает `ё` и `е`.'
+        )
+        assert sorted(self.search(client, 'ёЖиК', param='name')) == expected
+
+    def test_02_prefix_and_relevance(self, client, titles):
+        assert self.search(client, 'туман') == [
+            'Ёжик в тумане', 'Туманность Андромеды'
+        ]
+        assert self.search(client, 'туманность') == ['Туманность Андромеды']
+        assert self.search(client, 'ежик туман') == ['Ёжик в тумане']
+        assert self.search(client, 'мир войн') == ['Война и мир']
+
+    def test_03_index_follows_writes(self, client, titles):
+        title = titles['Война и мир']
+        title.name = 'Анна Каренина'
+        title.save()
+        assert self.search(client, 'война') == []
+        assert self.search(client, 'каренина') == ['Анна Каренина']
+
+        title.delete()
+        assert not TitleSearchToken.objects.filter(title_id=title.pk).exists()
+
+    def test_04_rebuild_command(self, client, titles):
+        TitleSearchToken.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        assert self.search(client, 'андромеды') == ['Туманность Андромеды']
+
+    def test_05_search_uses_index(self, titles):
+        sql, params = search_titles(
+            Title.objects.all(), 'ежик'
+        ).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'INDEX' in plan and '(token>? AND token<?)' in plan, (
+            'Проверьте, что поиск по префиксу использует индекс по словам '
+            f'названий. План запроса: {plan}'
+        )
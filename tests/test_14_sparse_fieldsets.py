@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        sql = '\n'.join(query['sql'] for query in context.captured_queries)
+        return response.json(), len(context), sql
+
+    def test_01_titles_fields(self, client, admin_client, admin, user_client,
+                              user):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        data, queries, sql = self.get(
+            client, f'{self.TITLES_URL}?fields=id,name,rating'
+        )
+        assert all(
+            set(title) == {'id', 'name', 'rating'} for title in data['results']
+        ), (
+            f'Проверьте, что параметр `fields` эндпоинта `{self.TITLES_URL}` '
+            'оставляет в ответе только запрошенные поля.'
+        )
+        assert queries == 2, (
+            'Проверьте, что при запросе без поля `genre` жанры '
+            'не загружаются из БД.'
+        )
+        assert '"description"' not in sql and 'reviews_category' not in sql
+
+        data, queries, _ = self.get(
+            client, f'{self.TITLES_URL}{titles[0]["id"]}/?exclude=genre'
+        )
+        assert 'genre' not in data and data['category'] is not None
+        assert queries == 1
+
+    def test_02_reviews_and_comments_exclude(self, client, admin_client,
+                                             admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data, _, sql = self.get(client, f'{url}?exclude=text')
+        assert set(data['results'][0]) == {
+            'id', 'author', 'score', 'pub_date', 'comment_count'
+        }
+        assert '"reviews_review"."text"' not in sql
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        data, _, sql = self.get(client, f'{url}?fields=id,author')
+        assert set(data['results'][0]) == {'id', 'author'}
+        assert '"reviews_comment"."text"' not in sql
@@ -0,0 +1,42 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleReadSerializer
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleListFastPath:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, make_title, category, genres):
+        for idx in range(6):
+            make_title(
+                name=f'Произведение {idx}',
+                year=1990 + idx,
+                genres=genres[:idx % 3],
+                description=None if idx % 2 else f'Описание {idx}',
+                category=category if idx % 3 else None,
+                rating=idx or None
+            )
+
+    @pytest.mark.parametrize('query', ['', '&fields=id,genre,category'])
+    def test_01_same_json_as_serializer(self, client, titles, query):
+        response = client.get(f'{self.TITLES_URL}?limit=10{query}')
+        expected = TitleReadSerializer(
+            Title.objects.order_by('rating'), many=True
+        ).data
+        if query:
+            expected = [
+                {key: title[key] for key in ('id', 'category', 'genre')}
+                for title in expected
+            ]
+        renderer = JSONRenderer()
+        assert renderer.render(response.json()['results']) == (
+            renderer.render(expected)
+        ), (
+            f'Проверьте, что список произведений `{self.TITLES_URL}` '
+            'сериализуется так же, как TitleReadSerializer.'
+        )
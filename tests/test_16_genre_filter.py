@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16MultiGenreFilter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, make_title, category, genres):
+        books = Category.objects.create(name='Книга', slug='books')
+        Category.objects.create(name='Музыка', slug='music')
+        drama, comedy = genres
+        horror = Genre.objects.create(name='Ужасы', slug='horror')
+        data = {
+            'Драма': (category, [drama]),
+            'Комедия': (books, [comedy]),
+            'Драмеди': (category, [drama, comedy]),
+            'Хоррор': (books, [horror]),
+        }
+        for name, (title_category, title_genres) in data.items():
+            make_title(
+                name=name, category=title_category, genres=title_genres
+            )
+
+    def names(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_genre_modes(self, client, titles):
+        assert self.names(client, 'genre=drama') == ['Драма', 'Драмеди']
+        assert self.names(client, 'genre=drama,comedy') == [
+            'Драма', 'Драмеди', 'Комедия'
+        ], (
+            'Проверьте, что параметр `genre` со списком жанров по умолчанию '
+            'возвращает произведения с любым из них.'
+        )
+        assert self.names(client, 'genre=drama,comedy&genre_mode=all') == [
+            'Драмеди'
+        ], (
+            'Проверьте, что `genre_mode=all` возвращает произведения, '
+            'у которых есть все перечисленные жанры.'
+        )
+        assert self.names(client, 'genre=unknown') == []
+
+    def test_02_categories(self, client, titles):
+        assert self.names(client, 'category=books,music') == [
+            'Комедия', 'Хоррор'
+        ]
+        assert self.names(client, 'category=films&genre=comedy') == [
+            'Драмеди'
+        ]
+
+    def test_03_index_refreshed_on_writes(self, client, titles):
+        assert self.names(client, 'genre=horror') == ['Хоррор']
+        Title.objects.get(name='Драма').genre.add(
+            Genre.objects.get(slug='horror')
+        )
+        assert self.names(client, 'genre=horror') == ['Драма', 'Хоррор']
+        Genre.objects.filter(slug='horror').update(slug='scary')
+        Genre.objects.get(slug='scary').save()
+        assert self.names(client, 'genre=scary') == ['Драма', 'Хоррор']
+
+    def test_04_large_result_applied_without_join(self, client, titles,
+                                                  monkeypatch):
+        monkeypatch.setattr('api.filters.GENRE_INDEX_MAX_IDS', 1)
+        links_table = Title.genre.through._meta.db_table
+        with CaptureQueriesContext(connection) as context:
+            assert self.names(
+                client, 'genre=drama,comedy&genre_mode=all'
+            ) == ['Драмеди']
+            assert self.names(client, 'genre=drama,horror') == [
+                'Драма', 'Драмеди', 'Хоррор'
+            ]
+        title_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT' not in query['sql'] and 'json_each' in query['sql']
+        ]
+        assert len(title_queries) == 2
+        assert not any(links_table in sql for sql in title_queries), (
+            'Проверьте, что большой результат индекса жанров применяется '
+            'без подзапросов к таблице связей произведений и жанров.'
+        )
+
+    def test_05_invalid_mode(self, client, titles):
+        response = client.get(f'{self.TITLES_URL}?genre=drama&genre_mode=x')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
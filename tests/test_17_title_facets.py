@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleFacets:
+
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    @pytest.fixture
+    def titles(self, make_title, category, genres):
+        books = Category.objects.create(name='Книга', slug='books')
+        drama, comedy = genres
+        data = [
+            ('Первое', 1984, category, [drama]),
+            ('Второе', 1988, category, [drama, comedy]),
+            ('Третье', 1995, books, [comedy]),
+            ('Четвёртое', 1995, None, []),
+        ]
+        for name, year, title_category, title_genres in data:
+            make_title(
+                name=name, year=year, category=title_category,
+                genres=title_genres
+            )
+
+    def get(self, client, query=''):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.FACETS_URL}{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.FACETS_URL}` не найден или недоступен.'
+        )
+        return response.json(), len(context)
+
+    def test_01_facets(self, client, titles):
+        data, queries = self.get(client)
+        assert data == {
+            'count': 4,
+            'category': [
+                {'slug': 'films', 'count': 2}, {'slug': 'books', 'count': 1}
+            ],
+            'genre': [
+                {'slug': 'comedy', 'count': 2}, {'slug': 'drama', 'count': 2}
+            ],
+            'year': [
+                {'year': 1984, 'count': 1},
+                {'year': 1988, 'count': 1},
+                {'year': 1995, 'count': 2},
+            ],
+        }
+        assert queries == 4, (
+            f'Проверьте, что `{self.FACETS_URL}` считает фасеты фиксированным '
+            'числом группирующих запросов.'
+        )
+
+        _, queries = self.get(client)
+        assert queries == 0, (
+            f'Проверьте, что ответ `{self.FACETS_URL}` кешируется.'
+        )
+
+    def test_02_filtered_decades(self, client, titles):
+        data, _ = self.get(client, '?category=films&year_bucket=decade')
+        assert data['count'] == 2
+        assert data['year'] == [{'decade': 1980, 'count': 2}]
+        assert data['genre'] == [
+            {'slug': 'drama', 'count': 2}, {'slug': 'comedy', 'count': 1}
+        ]
+
+    def test_03_invalidated_by_writes(self, client, titles):
+        self.get(client)
+        Title.objects.filter(name='Четвёртое').delete()
+        data, _ = self.get(client)
+        assert data['count'] == 3
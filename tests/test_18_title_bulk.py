@@ -0,0 +1,98 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('category', 'genres')
+class Test18TitleBulkCreate:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def make_items(self, count):
+        return [
+            {'name': f'Произведение {idx}', 'year': 2000,
+             'category': 'films', 'genre': ['drama', 'comedy']}
+            for idx in range(count)
+        ]
+
+    def test_01_json_array_with_errors(self, admin_client):
+        items = self.make_items(2) + [
+            {'name': 'Без жанра', 'year': 2000, 'category': 'films',
+             'genre': ['unknown']},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'films',
+             'genre': ['drama']},
+        ]
+        response = admin_client.post(
+            self.BULK_URL, data=json.dumps(items),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        data = response.json()
+        assert [item['index'] for item in data['created']] == [0, 1]
+        assert [error['index'] for error in data['errors']] == [2, 3], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает ошибки по каждому '
+            'элементу, не отменяя загрузку остальных.'
+        )
+        assert 'genre' in data['errors'][0]['errors']
+        assert 'year' in data['errors'][1]['errors']
+
+        title = Title.objects.get(pk=data['created'][0]['id'])
+        assert sorted(title.genre.values_list('slug', flat=True)) == [
+            'comedy', 'drama'
+        ]
+        response = admin_client.get('/api/v1/titles/?name=Произведение')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что загруженные произведения попадают в поисковый '
+            'индекс и список произведений.'
+        )
+        response = admin_client.get('/api/v1/titles/?genre=comedy')
+        assert response.json()['count'] == 2
+
+    def test_02_ndjson(self, admin_client):
+        body = '\n'.join(json.dumps(item) for item in self.make_items(3))
+        response = admin_client.post(
+            self.BULK_URL, data=body, content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        assert Title.objects.count() == 3
+
+    def test_03_constant_queries(self, admin_client):
+        # Пользователь из токена кешируется после первого запроса.
+        admin_client.get('/api/v1/users/me/')
+        counts = []
+        for count in (1, 50):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    self.BULK_URL, data=json.dumps(self.make_items(count)),
+                    content_type='application/json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            counts.append(len(context))
+        assert counts[0] == counts[1], (
+            f'Проверьте, что количество SQL-запросов к `{self.BULK_URL}` '
+            'не зависит от числа загружаемых произведений.'
+        )
+
+    def test_04_permissions_and_invalid(self, user_client, admin_client):
+        response = user_client.post(
+            self.BULK_URL, data=json.dumps(self.make_items(1)),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.post(
+            self.BULK_URL, data=json.dumps({'name': 'Одно'}),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.BULK_URL, data=json.dumps([{'name': 'Без полей'}]),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Title.objects.exists()
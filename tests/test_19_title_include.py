@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleInclude:
+
+    TITLE_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture
+    def titles(self, make_title, make_authors):
+        authors = make_authors(settings.TITLE_INCLUDE_REVIEWS + 2)
+        titles = [make_title(name=name) for name in ('Первое', 'Второе')]
+        for title in titles:
+            for author in authors:
+                review = Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=5
+                )
+                for _ in range(settings.TITLE_INCLUDE_COMMENTS + 1):
+                    Comment.objects.create(
+                        review=review, author=authors[0], text='Комментарий'
+                    )
+        return titles
+
+    def get(self, client, title, include):
+        url = self.TITLE_URL_TEMPLATE.format(title_id=title.pk)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'include': include})
+        assert response.status_code == HTTPStatus.OK, response.json()
+        return response, len(context)
+
+    def test_01_reviews_embedded(self, client, titles):
+        title = titles[1]
+        response, _ = self.get(client, title, 'reviews')
+        data = response.json()
+        expected = list(
+            title.reviews.order_by('pub_date', 'id').values_list(
+                'id', 'author__username'
+            )[:settings.TITLE_INCLUDE_REVIEWS]
+        )
+        assert [
+            (review['id'], review['author']) for review in data['reviews']
+        ] == expected, (
+            'Проверьте, что `?include=reviews` добавляет в карточку '
+            'произведения первую страницу его отзывов с авторами.'
+        )
+        assert 'comments' not in data['reviews'][0]
+        assert data['name'] == title.name
+        assert 'ETag' not in response, (
+            'Проверьте, что ответ с `?include=reviews` отдаётся без ETag: '
+            'comment_count отзывов не меняет версию каталога.'
+        )
+
+    def test_02_comments_embedded(self, client, titles):
+        title = titles[0]
+        response, _ = self.get(client, title, 'reviews.comments')
+        reviews = response.json()['reviews']
+        assert len(reviews) == settings.TITLE_INCLUDE_REVIEWS
+        for review in reviews:
+            expected = list(
+                Comment.objects.filter(review_id=review['id']).order_by(
+                    'pub_date', 'id'
+                ).values_list('id', flat=True)[
+                    :settings.TITLE_INCLUDE_COMMENTS
+                ]
+            )
+            assert [
+                comment['id'] for comment in review['comments']
+            ] == expected, (
+                'Проверьте, что `?include=reviews.comments` добавляет '
+                'к каждому отзыву первые комментарии.'
+            )
+        assert 'ETag' not in response
+
+    def test_03_bounded_queries(self, client, titles):
+        _, plain = self.get(client, titles[0], '')
+        _, with_reviews = self.get(client, titles[0], 'reviews')
+        _, with_comments = self.get(client, titles[0], 'reviews.comments')
+        assert with_reviews == plain + 1 and with_comments == plain + 2, (
+            'Проверьте, что отзывы и комментарии для `?include=` '
+            'загружаются одним запросом на каждую связь.'
+        )
+
+    def test_04_unknown_include(self, client, titles):
+        url = self.TITLE_URL_TEMPLATE.format(title_id=titles[0].pk)
+        response = client.get(url, {'include': 'reviews.author'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
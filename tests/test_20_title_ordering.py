@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+
+ORDERINGS = ['name', '-name', 'year', '-year', 'rating', '-rating']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, make_title):
+        ratings = [None, 7, 3, 7, None, 10, 3]
+        for idx, rating in enumerate(ratings):
+            make_title(
+                name=f'Произведение {idx % 3}',
+                year=1990 + idx % 2,
+                rating=rating
+            )
+
+    @pytest.mark.parametrize('ordering', ORDERINGS)
+    def test_01_ordering(self, client, titles, ordering):
+        tie_breaker = '-id' if ordering.startswith('-') else 'id'
+        expected = list(
+            Title.objects.order_by(ordering, tie_breaker).values_list(
+                'id', flat=True
+            )
+        )
+        response = client.get(self.TITLES_URL, {'ordering': ordering})
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            title['id'] for title in response.json()['results']
+        ] == expected, (
+            f'Проверьте, что `{self.TITLES_URL}?ordering={ordering}` '
+            'сортирует произведения по полю и затем по id.'
+        )
+
+    @pytest.mark.parametrize('ordering', ORDERINGS)
+    def test_02_ordering_uses_index(self, client, titles, ordering):
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLES_URL, {'ordering': ordering})
+        title_table = Title._meta.db_table
+        sql = next(
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{title_table}"' in query['sql']
+            and 'ORDER BY' in query['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, (
+            f'Проверьте, что сортировка `{ordering}` списка произведений '
+            f'выполняется по индексу. План запроса: {plan}'
+        )
+
+    def test_03_search_keeps_relevance(self, client, titles):
+        Title.objects.create(name='А домики', year=2000)
+        Title.objects.create(name='Большой дом', year=2000)
+        response = client.get(self.TITLES_URL, {'search': 'дом'})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Большой дом', 'А домики'
+        ], (
+            'Проверьте, что без параметра `ordering` результаты поиска '
+            'остаются отсортированными по релевантности.'
+        )
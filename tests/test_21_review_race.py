@@ -0,0 +1,79 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title
+
+PARALLEL_REQUESTS = 8
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReviewRace:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def title(self, make_title):
+        return make_title()
+
+    def test_01_duplicate_review(self, user_client, title):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        data = {'text': 'Отзыв', 'score': 5}
+        assert user_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Нельзя написать два отзыва на произведение']
+        }
+        title_queries = [
+            query for query in context.captured_queries
+            if f'FROM "{Title._meta.db_table}"' in query['sql']
+        ]
+        assert len(title_queries) == 1, (
+            'Проверьте, что при создании отзыва произведение '
+            'запрашивается из БД один раз.'
+        )
+        assert Review.objects.count() == 1
+
+    def test_02_parallel_posts(self, user, title):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        barrier = threading.Barrier(PARALLEL_REQUESTS)
+        statuses = []
+
+        def post():
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                response = client.post(
+                    url, data={'text': 'Отзыв', 'score': 5}
+                )
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=post) for _ in range(PARALLEL_REQUESTS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == [HTTPStatus.CREATED] + [
+            HTTPStatus.BAD_REQUEST
+        ] * (PARALLEL_REQUESTS - 1), (
+            'Проверьте, что при параллельных POST-запросах одного автора '
+            'создаётся ровно один отзыв, а остальные запросы получают '
+            f'ответ 400. Полученные статусы: {statuses}'
+        )
+        assert Review.objects.filter(author=user, title=title).count() == 1
+        title.refresh_from_db()
+        assert title.rating_count == 1
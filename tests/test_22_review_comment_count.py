@@ -0,0 +1,188 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+User = get_user_model()
+AUTHORS_COUNT = 5
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ReviewCommentCount:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def review(self, make_title, make_authors):
+        title = make_title()
+        authors = make_authors(AUTHORS_COUNT)
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            for author in authors
+        ]
+        for review, author in zip(reviews, authors):
+            Comment.objects.create(review=review, author=author, text='text')
+        return reviews[0]
+
+    def get_review(self, client, review):
+        response = client.get(self.REVIEW_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.pk
+        ))
+        return response.json()
+
+    def test_01_counter_follows_comments(self, user_client, admin_client,
+                                         review):
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.pk
+        )
+        assert self.get_review(user_client, review)['comment_count'] == 1
+        comment_ids = [
+            user_client.post(url, data={'text': 'Комментарий'}).json()['id']
+            for _ in range(2)
+        ]
+        assert self.get_review(user_client, review)['comment_count'] == 3, (
+            'Проверьте, что создание комментария увеличивает поле '
+            '`comment_count` отзыва.'
+        )
+        response = user_client.delete(f'{url}{comment_ids[0]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_review(user_client, review)['comment_count'] == 2, (
+            'Проверьте, что удаление комментария уменьшает поле '
+            '`comment_count` отзыва.'
+        )
+        response = admin_client.patch(
+            self.REVIEW_URL_TEMPLATE.format(
+                title_id=review.title_id, review_id=review.pk
+            ),
+            data={'text': 'Новый текст', 'comment_count': 100}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['comment_count'] == 2, (
+            'Проверьте, что поле `comment_count` доступно только для чтения '
+            'и не затирается при изменении отзыва.'
+        )
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context)
+
+    def test_02_constant_queries(self, client, review):
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=review.title_id
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.pk
+        )
+        single_review = Title.objects.create(name='Другой', year=2000)
+        Comment.objects.create(
+            review=Review.objects.create(
+                title=single_review, author=review.author, text='Отзыв',
+                score=5
+            ),
+            author=review.author,
+            text='text'
+        )
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='text')
+            for author in User.objects.exclude(pk=review.author_id)
+        )
+        for url, single_url in (
+            (reviews_url, self.REVIEWS_URL_TEMPLATE.format(
+                title_id=single_review.pk
+            )),
+            (comments_url, self.COMMENTS_URL_TEMPLATE.format(
+                title_id=single_review.pk,
+                review_id=single_review.reviews.get().pk
+            )),
+        ):
+            assert self.count_queries(client, url) == self.count_queries(
+                client, single_url
+            ), (
+                f'Проверьте, что количество SQL-запросов к `{url}` '
+                'не зависит от количества объектов на странице.'
+            )
+
+    def test_03_comment_invalidates_reviews(self, client, user_client,
+                                            review):
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=review.title_id
+        )
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.pk
+        )
+        etags = {url: client.get(url)['ETag'] for url in (
+            reviews_url, review_url
+        )}
+        comment_id = user_client.post(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=review.title_id, review_id=review.pk
+            ),
+            data={'text': 'Комментарий'}
+        ).json()['id']
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что новый комментарий меняет ETag '
+                f'`{url}`: в ответе есть `comment_count` отзыва.'
+            )
+            etags[url] = response['ETag']
+        Comment.objects.filter(pk=comment_id).delete()
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK
+
+    def test_04_cascade_updates_once(self, review):
+        title = review.title
+        other_title = Title.objects.create(name='Другой', year=2000)
+        other_reviews = [
+            Review.objects.create(
+                title=other_title, author=author, text='Отзыв', score=5
+            )
+            for author in User.objects.exclude(pk=review.author_id)[:2]
+        ]
+        for other_review in other_reviews:
+            for _ in range(3):
+                Comment.objects.create(
+                    review=other_review, author=review.author, text='text'
+                )
+        with CaptureQueriesContext(connection) as context:
+            title.delete()
+        updates = [
+            query for query in context.captured_queries
+            if query['sql'].startswith(
+                f'UPDATE "{Review._meta.db_table}"'
+            )
+        ]
+        assert not updates, (
+            'Проверьте, что при удалении произведения не обновляется '
+            '`comment_count` его же удаляемых отзывов.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            review.author.delete()
+        updates = [
+            query for query in context.captured_queries
+            if query['sql'].startswith(
+                f'UPDATE "{Review._meta.db_table}"'
+            )
+        ]
+        assert len(updates) == len(other_reviews), (
+            'Проверьте, что при каскадном удалении `comment_count` '
+            'отзыва обновляется одним запросом.'
+        )
+        assert sorted(
+            Review.objects.filter(title=other_title).values_list(
+                'comment_count', flat=True
+            )
+        ) == [0, 0]
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Comment, Review
+from tests.utils import make_cursor
+
+OBJECTS_COUNT = 7
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ReviewCursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def urls(self, make_title, make_authors):
+        title = make_title()
+        authors = make_authors(OBJECTS_COUNT)
+        for author in authors:
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+        review = Review.objects.order_by('id').first()
+        for author in authors:
+            Comment.objects.create(review=review, author=author, text='text')
+        # Одинаковые даты публикации проверяют порядок по id.
+        now = timezone.now()
+        for model in (Review, Comment):
+            for idx, pk in enumerate(
+                model.objects.order_by('id').values_list('id', flat=True)
+            ):
+                model.objects.filter(pk=pk).update(
+                    pub_date=now - timedelta(days=idx // 2)
+                )
+        return {
+            Review: self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk),
+            Comment: self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.pk, review_id=review.pk
+            ),
+        }
+
+    def walk(self, client, url, direction):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data
+            page_ids = [item['id'] for item in data['results']]
+            ids = page_ids + ids if direction == 'previous' else ids + page_ids
+            url = data[direction]
+        return ids, data
+
+    @pytest.mark.parametrize('model', [Review, Comment])
+    @pytest.mark.parametrize('ordering', ['pub_date', '-pub_date'])
+    def test_01_cursor_walk(self, client, urls, model, ordering):
+        tie_breaker = '-id' if ordering.startswith('-') else 'id'
+        expected = list(
+            model.objects.order_by(ordering, tie_breaker).values_list(
+                'id', flat=True
+            )
+        )
+        url = f'{urls[model]}?pagination=cursor&limit=2'
+        if ordering.startswith('-'):
+            url += f'&ordering={ordering}'
+        ids, last_page = self.walk(client, url, 'next')
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация `{urls[model]}` возвращает '
+            'все объекты по (pub_date, id) без пропусков и повторов.'
+        )
+        back_ids, _ = self.walk(client, last_page['previous'], 'previous')
+        assert back_ids == expected[:-1], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведёт '
+            'на предыдущие страницы.'
+        )
+
+    @pytest.mark.parametrize('model', [Review, Comment])
+    def test_02_page_number_kept(self, client, urls, model):
+        response = client.get(f'{urls[model]}?page=1')
+        data = response.json()
+        assert data['count'] == OBJECTS_COUNT
+        assert len(data['results']) == OBJECTS_COUNT
+
+    @pytest.mark.parametrize('model', [Review, Comment])
+    @pytest.mark.parametrize('ordering', ['pub_date', '-pub_date'])
+    def test_03_cursor_uses_index(self, client, urls, model, ordering):
+        url = f'{urls[model]}?pagination=cursor&ordering={ordering}&limit=2'
+        next_url = client.get(url).json()['next']
+        with CaptureQueriesContext(connection) as context:
+            client.get(next_url)
+        sql = next(
+            query['sql'] for query in context.captured_queries
+            if f'FROM "{model._meta.db_table}"' in query['sql']
+            and 'ORDER BY' in query['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, (
+            f'Проверьте, что курсорная пагинация `{urls[model]}` '
+            f'использует составной индекс. План запроса: {plan}'
+        )
+
+    @pytest.mark.parametrize('model', [Review, Comment])
+    @pytest.mark.parametrize('position', [
+        ['notadate', 1], [[2020], 1], ['2020-01-01T00:00:00Z', 'abc'],
+    ])
+    def test_04_tampered_cursor(self, client, urls, model, position):
+        cursor = make_cursor({'p': position, 'o': 'pub_date'})
+        response = client.get(
+            f'{urls[model]}?pagination=cursor&cursor={cursor}'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что `{urls[model]}` отвечает 404 на курсор '
+            'с подделанной позицией.'
+        )
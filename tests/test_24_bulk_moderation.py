@@ -0,0 +1,122 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from api.moderation import delete_content
+from reviews.models import Comment, Review, Title
+
+User = get_user_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkModeration:
+
+    URL = '/api/v1/moderation/delete/'
+
+    @pytest.fixture
+    def spam(self, user, make_title):
+        spammer = User.objects.create_user(
+            username='spammer', email='spammer@yamdb.fake'
+        )
+        titles = [
+            make_title(name=name) for name in ('Первое', 'Второе', 'Третье')
+        ]
+        honest = [
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=8
+            )
+            for title in titles
+        ]
+        spam_reviews = [
+            Review.objects.create(
+                title=title, author=spammer, text='Спам', score=1
+            )
+            for title in titles
+        ]
+        for review in honest + spam_reviews:
+            Comment.objects.create(review=review, author=spammer, text='Спам')
+            Comment.objects.create(review=review, author=user, text='Ответ')
+        return {'spammer': spammer, 'honest': honest, 'spam': spam_reviews}
+
+    def assert_counters_consistent(self):
+        out = StringIO()
+        call_command('recalculate_ratings', '--dry-run', stdout=out)
+        assert 'Найдено расхождений: 0' in out.getvalue(), (
+            'Проверьте, что массовое удаление сохраняет согласованными '
+            'счётчики рейтинга произведений.'
+        )
+        for review in Review.objects.annotate(actual=Count('comments')):
+            assert review.comment_count == review.actual, (
+                'Проверьте, что массовое удаление комментариев обновляет '
+                '`comment_count` отзывов.'
+            )
+
+    def test_01_delete_by_author(self, moderator_client, spam):
+        response = moderator_client.post(
+            self.URL, data={'author': 'spammer'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, response.json()
+        data = response.json()
+        assert data['reviews'] == 3
+        # 6 комментариев спамера и 3 ответа под его отзывами.
+        assert data['comments'] == 9
+        assert not Review.objects.filter(author=spam['spammer']).exists()
+        assert not Comment.objects.filter(author=spam['spammer']).exists()
+        assert Review.objects.count() == 3
+        assert set(Title.objects.values_list('rating', flat=True)) == {8}
+        self.assert_counters_consistent()
+
+    def test_02_delete_by_ids_and_since(self, admin_client, spam):
+        comment = Comment.objects.filter(review=spam['honest'][0]).first()
+        response = admin_client.post(self.URL, data={
+            'reviews': [spam['spam'][0].pk, 10 ** 6],
+            'comments': [comment.pk],
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['reviews'] == 1
+        assert response.json()['comments'] == 3
+        self.assert_counters_consistent()
+
+        response = admin_client.post(self.URL, data={
+            'author': 'spammer',
+            'since': (timezone.now() + timezone.timedelta(days=1)).isoformat()
+        }, format='json')
+        assert response.json() == {'reviews': 0, 'comments': 0, 'batches': 0}
+
+    def test_03_batches(self, spam):
+        summary = delete_content(author=spam['spammer'], batch_size=2)
+        assert summary == {'reviews': 3, 'comments': 9, 'batches': 5}, (
+            'Проверьте, что удаление идёт порциями заданного размера.'
+        )
+        self.assert_counters_consistent()
+
+    def test_04_cache_versions_bumped(self, client, moderator_client, spam):
+        url = f'/api/v1/titles/{spam["spam"][0].title_id}/reviews/'
+        etag = client.get(url)['ETag']
+        moderator_client.post(
+            self.URL, data={'reviews': [spam['spam'][0].pk]}, format='json'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что массовое удаление сбрасывает кеш отзывов.'
+        )
+
+    def test_05_permissions_and_validation(self, user_client, admin_client,
+                                           spam):
+        response = user_client.post(
+            self.URL, data={'author': 'spammer'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert admin_client.post(
+            self.URL, data={}, format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        assert admin_client.post(
+            self.URL, data={'since': timezone.now().isoformat()},
+            format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        assert Review.objects.count() == 6
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from api.moderation import delete_content
+from reviews.models import Comment, Review, Title
+
+User = get_user_model()
+TITLES_COUNT = 5
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AuthorFeeds:
+
+    USER_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    @pytest.fixture
+    def activity(self, user, admin, make_title):
+        titles = [
+            make_title(name=f'Произведение {idx}')
+            for idx in range(TITLES_COUNT)
+        ]
+        for title in titles:
+            review = Review.objects.create(
+                title=title, author=user, text='Отзыв', score=5
+            )
+            Comment.objects.create(review=review, author=admin, text='text')
+            Comment.objects.create(review=review, author=user, text='text')
+        return titles
+
+    def assert_counters_match(self):
+        users = User.objects.annotate(
+            reviews_total=Count('reviews', distinct=True),
+            comments_total=Count('comments', distinct=True)
+        )
+        for user in users:
+            assert (user.review_count, user.comment_count) == (
+                user.reviews_total, user.comments_total
+            ), (
+                'Проверьте, что счётчики отзывов и комментариев пользователя '
+                f'`{user.username}` совпадают с их количеством.'
+            )
+
+    def walk(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids, data
+
+    @pytest.mark.parametrize('feed,model', [
+        ('reviews', Review), ('comments', Comment)
+    ])
+    def test_01_feed(self, client, user, activity, feed, model):
+        url = self.USER_URL_TEMPLATE.format(username=user.username) + feed
+        ids, data = self.walk(client, f'{url}/?limit=2')
+        expected = list(
+            model.objects.filter(author=user).order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        )
+        assert ids == expected, (
+            f'Проверьте, что `{url}/` возвращает записи пользователя '
+            'от новых к старым без пропусков и повторов.'
+        )
+        assert data['count'] == TITLES_COUNT
+        item = client.get(f'{url}/').json()['results'][0]
+        assert item['author'] == user.username
+        assert isinstance(item['title'], int)
+
+    def test_02_feed_without_count_query(self, client, user, activity):
+        url = self.USER_URL_TEMPLATE.format(username=user.username)
+        for feed in ('reviews', 'comments'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(f'{url}{feed}/')
+            assert response.status_code == HTTPStatus.OK
+            assert not any(
+                'COUNT(' in query['sql'] for query in context.captured_queries
+            ), (
+                f'Проверьте, что `{url}{feed}/` берёт количество записей '
+                'из счётчика пользователя, а не из COUNT-запроса.'
+            )
+            assert len(context) == 2
+
+    def test_03_counters_follow_writes(self, user_client, admin_client,
+                                       user, activity):
+        self.assert_counters_match()
+        title = activity[0]
+        review = title.reviews.get()
+        response = user_client.delete(
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        self.assert_counters_match()
+
+        response = admin_client.patch(
+            self.USER_URL_TEMPLATE.format(username=user.username),
+            data={'bio': 'Новое био'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        self.assert_counters_match()
+
+        delete_content(author=user, batch_size=2)
+        self.assert_counters_match()
+        Title.objects.get(pk=activity[1].pk).delete()
+        self.assert_counters_match()
+
+    def test_04_unknown_user(self, client):
+        response = client.get(
+            self.USER_URL_TEMPLATE.format(username='nobody') + 'reviews/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('feed,model', [
+        ('reviews', Review), ('comments', Comment)
+    ])
+    def test_05_feed_uses_index(self, client, user, activity, feed, model):
+        url = self.USER_URL_TEMPLATE.format(username=user.username) + feed
+        next_url = client.get(f'{url}/?limit=2').json()['next']
+        with CaptureQueriesContext(connection) as context:
+            client.get(next_url)
+        sql = next(
+            query['sql'] for query in context.captured_queries
+            if f'FROM "{model._meta.db_table}"' in query['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, (
+            f'Проверьте, что лента `{url}/` использует индекс по автору '
+            f'и дате публикации. План запроса: {plan}'
+        )
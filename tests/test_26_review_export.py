@@ -0,0 +1,101 @@
+import csv
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Comment, Review
+
+REVIEWS_COUNT = 5
+EXPORT_KEYS = {'id', 'author', 'text', 'score', 'pub_date', 'comment_count'}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReviewExport:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/export/'
+
+    @pytest.fixture
+    def title(self, user, make_title, make_authors):
+        title = make_title()
+        start = timezone.now() - timedelta(days=REVIEWS_COUNT)
+        for idx, author in enumerate(make_authors(REVIEWS_COUNT)):
+            review = Review.objects.create(
+                title=title, author=author, text=f'Отзыв "{idx}",\nстрока',
+                score=idx + 1
+            )
+            Review.objects.filter(pk=review.pk).update(
+                pub_date=start + timedelta(days=idx)
+            )
+        Comment.objects.create(
+            review=Review.objects.earliest('pub_date'), author=user,
+            text='text'
+        )
+        return title
+
+    def export(self, client, title_id, query=''):
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=title_id) + query
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+            body = b''.join(response.streaming_content).decode()
+        return response, body, len(context)
+
+    def test_01_ndjson_export(self, client, title):
+        response, body, queries = self.export(client, title.pk)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отзывов отдаётся потоком.'
+        )
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert len(rows) == REVIEWS_COUNT, (
+            'Проверьте, что выгрузка содержит по одной строке NDJSON '
+            'на каждый отзыв произведения.'
+        )
+        assert all(set(row) == EXPORT_KEYS for row in rows)
+        assert [row['score'] for row in rows] == list(
+            range(1, REVIEWS_COUNT + 1)
+        ), 'Проверьте, что отзывы выгружаются в порядке публикации.'
+        assert rows[0]['author'] == 'author0'
+        assert rows[0]['comment_count'] == 1
+        assert queries == 2, (
+            'Проверьте, что выгрузка выполняет проверку произведения и '
+            'один запрос к отзывам с авторами.'
+        )
+
+    def test_02_csv_and_since(self, client, title):
+        since = Review.objects.order_by('pub_date')[2].pub_date
+        response, body, _ = self.export(
+            client, title.pk,
+            f'?output=csv&since={since.isoformat().replace("+00:00", "Z")}'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(body.splitlines(keepends=True)))
+        assert set(rows[0]) == EXPORT_KEYS
+        assert [row['author'] for row in rows] == ['author2', 'author3',
+                                                   'author4'], (
+            'Проверьте, что параметр `since` оставляет в выгрузке только '
+            'отзывы, опубликованные начиная с указанной даты.'
+        )
+        assert rows[0]['text'] == 'Отзыв "2",\nстрока'
+
+    def test_03_unknown_title(self, client, title):
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=title.pk + 1)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что выгрузка отзывов несуществующего произведения '
+            'возвращает ответ со статусом 404.'
+        )
+
+    def test_04_invalid_params(self, client, title):
+        for query in ('?output=xml', '?since=вчера'):
+            url = self.EXPORT_URL_TEMPLATE.format(title_id=title.pk) + query
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что запрос к `{url}` с некорректным параметром '
+                'возвращает ответ со статусом 400.'
+            )
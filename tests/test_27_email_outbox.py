@@ -0,0 +1,125 @@
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.constants import OUTBOX_FAILED, OUTBOX_PENDING, OUTBOX_SENT
+from users.models import OutgoingEmail
+from users.outbox import claim_batch, deliver, enqueue_email
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise SMTPException('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {'username': 'valid_user', 'email': 'valid@yamdb.fake'}
+
+    @pytest.fixture(autouse=True)
+    def queued(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+
+    def test_01_signup_enqueues_without_sending(self, client):
+        for _ in range(3):
+            response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+            assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо не отправляется в '
+            'процессе запроса, а ставится в очередь.'
+        )
+        assert OutgoingEmail.objects.count() == 1, (
+            'Проверьте, что повторная регистрация того же пользователя не '
+            'добавляет в очередь второе письмо.'
+        )
+
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [self.SIGNUP_DATA['email']]
+        email = OutgoingEmail.objects.get()
+        assert email.status == OUTBOX_SENT and email.dedupe_key is None
+
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert OutgoingEmail.objects.filter(
+            status=OUTBOX_PENDING
+        ).count() == 1, (
+            'Проверьте, что после отправки письма повторная регистрация '
+            'снова ставит письмо в очередь.'
+        )
+
+    def test_02_batch_reuses_connection(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_27_email_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        for idx in range(5):
+            enqueue_email(f'user{idx}@yamdb.fake', 'Тема', 'Текст')
+        call_command('send_outbox', once=True, batch_size=10)
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что порция писем отправляется через одно соединение.'
+        )
+        assert not OutgoingEmail.objects.exclude(status=OUTBOX_SENT).exists()
+
+    def test_03_retries_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_27_email_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        email = enqueue_email('user@yamdb.fake', 'Тема', 'Текст', 'signup:1')
+
+        started = timezone.now()
+        call_command('send_outbox', once=True)
+        email.refresh_from_db()
+        assert email.status == OUTBOX_PENDING and email.attempts == 1
+        assert email.available_at >= started + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+        ), 'Проверьте, что неудачная отправка откладывается.'
+        assert 'SMTP недоступен' in email.last_error
+
+        call_command('send_outbox', once=True)
+        email.refresh_from_db()
+        assert email.attempts == 1, (
+            'Проверьте, что отложенное письмо не отправляется до срока.'
+        )
+
+        OutgoingEmail.objects.update(available_at=timezone.now())
+        call_command('send_outbox', once=True)
+        email.refresh_from_db()
+        assert email.status == OUTBOX_FAILED and email.dedupe_key is None, (
+            'Проверьте, что после последней попытки письмо помечается '
+            'недоставленным.'
+        )
+
+    def test_04_requeued_while_sending(self):
+        enqueue_email('user@yamdb.fake', 'Тема', 'Старый код', 'signup:1')
+        claimed = claim_batch()
+        # Повторная регистрация во время отправки заменяет текст письма.
+        enqueue_email('user@yamdb.fake', 'Тема', 'Новый код', 'signup:1')
+        deliver(claimed)
+        email = OutgoingEmail.objects.get()
+        assert email.status == OUTBOX_PENDING and email.body == 'Новый код', (
+            'Проверьте, что письмо, заменённое во время отправки, '
+            'не помечается отправленным и остаётся в очереди.'
+        )
+
+        call_command('send_outbox', once=True)
+        assert [message.body for message in mail.outbox] == [
+            'Старый код', 'Новый код'
+        ]
+        email.refresh_from_db()
+        assert email.status == OUTBOX_SENT
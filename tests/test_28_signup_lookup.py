@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from api.serializers import SignupSerializer
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SignupLookup:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {'username': 'valid_user', 'email': 'valid@yamdb.fake'}
+
+    def user_queries(self, context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if '"users_user"' in query['sql']
+        ]
+
+    def test_01_single_lookup(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        queries = self.user_queries(context)
+        assert len(queries) == 2 and queries[0].startswith('SELECT'), (
+            'Проверьте, что при регистрации username и email проверяются '
+            'одним запросом перед созданием пользователя.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(self.user_queries(context)) == 1, (
+            'Проверьте, что при повторной регистрации найденный '
+            'пользователь используется без дополнительных запросов.'
+        )
+
+    def test_02_concurrent_signup(self, django_user_model):
+        serializer = SignupSerializer(data=self.SIGNUP_DATA)
+        assert serializer.is_valid()
+        user = django_user_model.objects.create(**self.SIGNUP_DATA)
+        assert serializer.save().pk == user.pk, (
+            'Проверьте, что при параллельной регистрации того же '
+            'пользователя возвращается уже созданный пользователь.'
+        )
+
+        serializer = SignupSerializer(
+            data={'username': 'other_user', 'email': 'other@yamdb.fake'}
+        )
+        assert serializer.is_valid()
+        django_user_model.objects.create(
+            username='third_user', email='other@yamdb.fake'
+        )
+        with pytest.raises(ValidationError) as error:
+            serializer.save()
+        assert 'email' in error.value.detail, (
+            'Проверьте, что при гонке за email регистрация возвращает '
+            'ошибку валидации, а не ошибку сервера.'
+        )
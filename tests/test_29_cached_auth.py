@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import CachedJWTAuthentication, user_cache_key
+from api.cache import get_api_cache
+
+User = get_user_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29CachedAuth:
+
+    ME_URL = '/api/v1/users/me/'
+    USERS_URL = '/api/v1/users/'
+    USER_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        user_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "users_user"' in query['sql']
+        ]
+        return response, user_queries
+
+    def test_01_user_cached_between_requests(self, user_client, user):
+        stats = CachedJWTAuthentication.cache_stats
+        stats.reset()
+        response, queries = self.get(user_client, self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1
+
+        response, queries = self.get(user_client, self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not queries, (
+            'Проверьте, что пользователь из токена не загружается из БД '
+            'при повторных запросах.'
+        )
+        assert (stats.hits, stats.misses) == (1, 1)
+        snapshot = get_api_cache().get(user_cache_key(user.pk))
+        assert isinstance(snapshot, dict), (
+            'Проверьте, что в кеше хранится снимок пользователя, '
+            'а не модель целиком.'
+        )
+
+        response, _ = self.get(user_client, self.ME_URL)
+        assert response.json()['username'] == user.username
+        user_client.patch(self.ME_URL, data={'bio': 'Новое био'})
+        response, _ = self.get(user_client, self.ME_URL)
+        assert response.json()['bio'] == 'Новое био'
+
+    def test_02_role_change_invalidates(self, admin_client, user_client, user):
+        response, _ = self.get(user_client, self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        admin_client.patch(
+            self.USER_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        response, _ = self.get(user_client, self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена роли пользователя сбрасывает его запись '
+            'в кеше аутентификации.'
+        )
+
+    def test_03_deleted_or_inactive_user_rejected(self, admin_client,
+                                                  user_client, user,
+                                                  moderator_client,
+                                                  moderator):
+        self.get(user_client, self.ME_URL)
+        admin_client.delete(
+            self.USER_URL_TEMPLATE.format(username=user.username)
+        )
+        response, _ = self.get(user_client, self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после удаления пользователя его токен '
+            'перестаёт действовать.'
+        )
+
+        self.get(moderator_client, self.ME_URL)
+        moderator.is_active = False
+        moderator.save()
+        response, _ = self.get(moderator_client, self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_04_stale_cache_not_saved(self, user_client, user):
+        self.get(user_client, self.ME_URL)
+        # QuerySet.update() не сбрасывает запись в кеше.
+        User.objects.filter(pk=user.pk).update(role='moderator')
+        response = user_client.patch(self.ME_URL, data={'bio': 'Новое био'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert (user.role, user.bio) == ('moderator', 'Новое био'), (
+            'Проверьте, что изменение профиля через `/users/me/` '
+            'не возвращает роль из устаревшей копии пользователя.'
+        )
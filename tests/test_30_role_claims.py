@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import token_versions
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30RoleClaims:
+
+    TOKEN_URL = '/api/v1/auth/token/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    USER_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    @pytest.fixture(autouse=True)
+    def role_claims(self, settings):
+        settings.JWT_ROLE_CLAIMS = True
+        token_versions.clear()
+        yield
+        token_versions.clear()
+
+    def claims_client(self, user):
+        response = APIClient().post(self.TOKEN_URL, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def post_category(self, client, slug):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                self.CATEGORIES_URL, data={'name': slug, 'slug': slug}
+            )
+        user_queries = [
+            query['sql'] for query in context.captured_queries
+            if '"users_user"' in query['sql']
+        ]
+        return response, user_queries
+
+    def test_01_permissions_from_claims(self, admin):
+        client = self.claims_client(admin)
+        response, _ = self.post_category(client, 'first')
+        assert response.status_code == HTTPStatus.CREATED
+        response, user_queries = self.post_category(client, 'second')
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries, (
+            'Проверьте, что при токене с claims роли права проверяются '
+            'без запросов к таблице пользователей.'
+        )
+        response = client.get(
+            self.USER_URL_TEMPLATE.format(username='me')
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['username'] == admin.username
+
+    def test_02_role_change_revokes_token(self, admin_client, moderator):
+        moderator_client = self.claims_client(moderator)
+        response, _ = self.post_category(moderator_client, 'first')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        admin_client.patch(
+            self.USER_URL_TEMPLATE.format(username=moderator.username),
+            data={'role': 'admin'}
+        )
+        response, _ = self.post_category(moderator_client, 'second')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли токен с прежними claims '
+            'отклоняется.'
+        )
+        moderator.refresh_from_db()
+        response, _ = self.post_category(
+            self.claims_client(moderator), 'third'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        admin_client.patch(
+            self.USER_URL_TEMPLATE.format(username=moderator.username),
+            data={'bio': 'Новое био'}
+        )
+        moderator.refresh_from_db()
+        client = self.claims_client(moderator)
+        admin_client.patch(
+            self.USER_URL_TEMPLATE.format(username=moderator.username),
+            data={'bio': 'Другое био'}
+        )
+        response, _ = self.post_category(client, 'fourth')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что изменения профиля без смены роли не отзывают '
+            'токены.'
+        )
+
+    def test_03_reviews_with_claims_user(self, user, make_title):
+        title = make_title()
+        client = self.claims_client(user)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_url = f'{url}{response.json()["id"]}/'
+        response = client.post(url, data={'text': 'Ещё', 'score': 4})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.patch(review_url, data={'score': 1})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном из claims может изменить '
+            'свой отзыв.'
+        )
@@ -0,0 +1,74 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import verified_tokens
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31VerifiedTokens:
+
+    ME_URL = '/api/v1/users/me/'
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        verified_tokens.clear()
+        verified_tokens.stats.reset()
+        yield
+        verified_tokens.clear()
+
+    def test_01_token_verified_once(self, user_client):
+        with mock.patch.object(
+            AccessToken, 'verify', autospec=True,
+            side_effect=AccessToken.verify
+        ) as verify:
+            for _ in range(3):
+                assert user_client.get(self.ME_URL).status_code == (
+                    HTTPStatus.OK
+                )
+        assert verify.call_count == 1, (
+            'Проверьте, что подпись повторно присланного токена '
+            'не проверяется заново.'
+        )
+        assert (verified_tokens.stats.hits, verified_tokens.stats.misses) == (
+            2, 1
+        )
+
+    def test_02_invalid_token_not_cached(self, token_user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {token_user["access"][:-2]}xx'
+        )
+        for _ in range(2):
+            assert client.get(self.ME_URL).status_code == (
+                HTTPStatus.UNAUTHORIZED
+            )
+        assert verified_tokens.stats.hits == 0, (
+            'Проверьте, что токен с неверной подписью не попадает в кеш.'
+        )
+
+    def test_03_expiry_and_lru(self, settings, user, admin, moderator):
+        settings.VERIFIED_TOKEN_CACHE_SIZE = 2
+        tokens = [AccessToken.for_user(item) for item in (user, admin)]
+        for token in tokens:
+            verified_tokens.set(str(token).encode(), token)
+        assert verified_tokens.get(str(tokens[0]).encode()) is tokens[0]
+
+        newest = AccessToken.for_user(moderator)
+        verified_tokens.set(str(newest).encode(), newest)
+        assert verified_tokens.get(str(tokens[1]).encode()) is None, (
+            'Проверьте, что при переполнении из кеша вытесняется давно '
+            'не использованный токен.'
+        )
+        assert verified_tokens.get(str(tokens[0]).encode()) is tokens[0]
+
+        with mock.patch('time.time', return_value=newest['exp'] + 1):
+            assert verified_tokens.get(str(newest).encode()) is None, (
+                'Проверьте, что токен не берётся из кеша после истечения '
+                'срока действия.'
+            )
+        assert time.time() < newest['exp']
@@ -1,4 +1,7 @@
+import json
+from base64 import b64encode
 from http import HTTPStatus
+from urllib.parse import quote
 
 
 check_name_and_slug_patterns = (
@@ -305,3 +308,8 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def make_cursor(payload):
+    """Курсор пагинации с произвольным содержимым."""
+    return quote(b64encode(json.dumps(payload).encode()).decode())